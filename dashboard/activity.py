@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+from django.db.models import Avg, Count, DateTimeField, Max
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import TaskEvent
+
+
+ACTOR_ATTR = '_activity_actor'
+PERIODS = ('day', 'week', 'month')
+STATUS_NAMES = {code: status for status, code in TaskEvent.STATUS_CODES.items()}
+
+
+# ---------------- Writing ----------------
+# Events are written by the Task post_save signal (and by the bulk status path),
+# inside the caller's transaction, so a rolled-back edit leaves no history.
+
+def acting_as(task, user):
+    """Record ``user`` as the actor of the next status change saved on ``task``."""
+    setattr(task, ACTOR_ATTR, user)
+    return task
+
+
+def _seconds(delta):
+    return max(0, int(delta.total_seconds()))
+
+
+def record_created(tasks, actor_id=None):
+    """Opening events for new tasks, in one INSERT."""
+    TaskEvent.objects.bulk_create([
+        TaskEvent(task_id=task.pk, actor_id=actor_id, to_status=TaskEvent.STATUS_CODES[task.status],
+                  timestamp=task.created_at, age=0)
+        for task in tasks
+    ], batch_size=1000)
+
+
+def record_change(task, old_status, actor_id=None, now=None):
+    """
+    Log ``task`` moving from ``old_status`` to its current status; returns the event or None.
+
+    ``old_status`` may be None when the caller could not tell (deferred field),
+    in which case the latest logged status is used.
+    """
+    if old_status == task.status:
+        return None
+    last = task.events.order_by('-timestamp').values_list('to_status', 'timestamp').first()
+    if old_status is None:
+        if last is None or STATUS_NAMES[last[0]] == task.status:
+            return None
+        old_status = STATUS_NAMES[last[0]]
+    now = now or timezone.now()
+    since = last[1] if last else task.created_at
+    return TaskEvent.objects.create(
+        task=task, actor_id=actor_id, from_status=TaskEvent.STATUS_CODES[old_status],
+        to_status=TaskEvent.STATUS_CODES[task.status], timestamp=now,
+        duration=_seconds(now - since), age=_seconds(now - task.created_at),
+    )
+
+
+def record_bulk_change(queryset, new_status, actor_id=None, now=None):
+    """
+    Log ``queryset.update(status=new_status)`` before it runs: two reads and one multi-row INSERT.
+
+    Set-based counterpart of record_change for the bulk edit, which sends no signals.
+    """
+    now = now or timezone.now()
+    changing = list(queryset.exclude(status=new_status).values_list('id', 'status', 'created_at'))
+    last_seen = dict(
+        TaskEvent.objects.filter(task_id__in=[row[0] for row in changing])
+        .values('task_id').annotate(last=Max('timestamp')).order_by().values_list('task_id', 'last')
+    )
+    TaskEvent.objects.bulk_create([
+        TaskEvent(
+            task_id=pk, actor_id=actor_id, from_status=TaskEvent.STATUS_CODES[status],
+            to_status=TaskEvent.STATUS_CODES[new_status], timestamp=now,
+            duration=_seconds(now - last_seen.get(pk, created_at)), age=_seconds(now - created_at),
+        )
+        for pk, status, created_at in changing
+    ], batch_size=1000)
+    return len(changing)
+
+
+# ---------------- Reports ----------------
+def period_start(period):
+    return Trunc('timestamp', period, output_field=DateTimeField())
+
+
+def throughput(start, end, period='week'):
+    """Per period: tasks completed, and their average and longest cycle time (creation to completion)."""
+    return (
+        TaskEvent.objects.filter(to_status=TaskEvent.COMPLETED, timestamp__gte=start, timestamp__lt=end)
+        .exclude(from_status=None)  # created as already done
+        .annotate(period=period_start(period)).values('period')
+        .annotate(completed=Count('id'), avg_cycle=Avg('age'), max_cycle=Max('age'))
+        .order_by('period')
+    )
+
+
+def time_in_status(start, end, period='week'):
+    """Per period and status: how many tasks left it, and how long they had spent in it."""
+    return (
+        # An IN list rather than IS NOT NULL, so each status is one (from_status, timestamp) range scan.
+        TaskEvent.objects.filter(from_status__in=list(STATUS_NAMES), timestamp__gte=start, timestamp__lt=end)
+        .annotate(period=period_start(period)).values('period', 'from_status')
+        .annotate(exits=Count('id'), avg_duration=Avg('duration'), max_duration=Max('duration'))
+        .order_by('period', 'from_status')
+    )
+
+
+def activity_report(period='week', days=90, now=None):
+    """
+    Rows of per-period throughput and time-in-status, newest period first.
+
+    Both inputs are already aggregated by the database, so this only merges a
+    handful of rows per period; durations are reported in hours.
+    """
+    if period not in PERIODS:
+        period = 'week'
+    end = now or timezone.now()
+    start = end - timedelta(days=days)
+    rows = {}
+
+    def row(period_start_):
+        return rows.setdefault(period_start_, {'period': period_start_, 'completed': 0, 'status_hours': {}})
+
+    for item in throughput(start, end, period):
+        entry = row(item['period'])
+        entry['completed'] = item['completed']
+        entry['avg_cycle_hours'] = item['avg_cycle'] / 3600
+        entry['max_cycle_hours'] = item['max_cycle'] / 3600
+    for item in time_in_status(start, end, period):
+        if item['avg_duration'] is not None:
+            row(item['period'])['status_hours'][STATUS_NAMES[item['from_status']]] = item['avg_duration'] / 3600
+    return sorted(rows.values(), key=lambda entry: entry['period'], reverse=True)
@@ -0,0 +1,74 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.db.models import Prefetch
+from django.shortcuts import redirect, render
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from . import fragments, stats
+from .forms import TaskFilterForm
+from .models import Employee, Task
+from .pagination import apaginate, paginate
+from .views import TASKS_PER_PAGE, employee_task_feed
+
+
+# ---------------- Async Read Views ----------------
+# Async versions of the read-heavy pages for ASGI deployments. They fetch with
+# the async ORM and render the same templates; data behind a {% cache %} block
+# that is already stored is not fetched at all (a lazy sync fallback covers an
+# entry expiring before the template reaches it). dashboard.urls serves them at
+# the usual URLs when DASHBOARD_ASYNC_VIEWS = True, and always under async/.
+
+arender = sync_to_async(render)
+
+
+@login_required
+async def dashboard(request):
+    today = timezone.localdate()
+    context = await fragments.afragment_context(fragments.TASKS, fragments.EMPLOYEES)
+    context['today'] = today
+    if await fragments.ais_cached('dashboard_counters', context['fragment_version'], today):
+        context['counters'] = SimpleLazyObject(lambda: stats.read_counters(today))
+    else:
+        context['counters'] = await stats.aread_counters(today)
+    return await arender(request, 'dashboard/dashboard.html', context)
+
+
+@login_required
+async def all_tasks(request):
+    # Form validation looks up the chosen assignee; keep it in one sync hop.
+    filter_form = TaskFilterForm(request.GET or None)
+    tasks = await sync_to_async(filter_form.filter_queryset)(Task.objects.all())
+    context = await fragments.afragment_context(fragments.TASKS)
+    context['filter_form'] = filter_form
+    tasks = tasks.prefetch_related(Prefetch('assigned_employees', queryset=Employee.objects.only('id', 'name')))
+    cursor = request.GET.get('cursor')
+    if await fragments.ais_cached('all_tasks_table', context['fragment_version'], request.GET.urlencode()):
+        context['page'] = SimpleLazyObject(lambda: paginate(tasks, cursor, per_page=TASKS_PER_PAGE))
+    else:
+        context['page'] = await apaginate(tasks, cursor, per_page=TASKS_PER_PAGE)
+    return await arender(request, 'dashboard/all_tasks.html', context)
+
+
+@login_required
+async def employee_list(request):
+    context = await fragments.afragment_context(fragments.EMPLOYEES)
+    employees = Employee.objects.select_related('user')
+    if await fragments.ais_cached('employee_cards', context['fragment_version']):
+        context['employees'] = employees  # lazy; only evaluated if the entry expired meanwhile
+    else:
+        context['employees'] = [employee async for employee in employees]
+    return await arender(request, 'dashboard/employee_list.html', context)
+
+
+async def employee_dashboard(request):
+    employee_id = await request.session.aget('employee_id')
+    user = await request.auser()
+    if employee_id is None and user.is_authenticated:
+        employee_id = await Employee.objects.filter(user=user).values_list('id', flat=True).afirst()
+        await request.session.aset('employee_id', employee_id)
+    if employee_id is None:
+        return redirect('employee_login')
+
+    page = await apaginate(employee_task_feed(employee_id), request.GET.get('cursor'), per_page=TASKS_PER_PAGE)
+    return await arender(request, 'dashboard/employee_dashboard.html', {'tasks': page.object_list, 'page': page})
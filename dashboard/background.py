@@ -0,0 +1,51 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# ---------------- In-process Background Pool ----------------
+# Work that should not hold up the response (notification fan-out, thumbnails)
+# is handed to a small per-process thread pool once the surrounding transaction
+# commits. Set DASHBOARD_BACKGROUND_INLINE = True to run it synchronously, e.g.
+# in tests where worker threads cannot see uncommitted test data.
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'DASHBOARD_BACKGROUND_WORKERS', 2),
+                thread_name_prefix='dashboard-bg',
+            )
+        return _executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background job %s failed", getattr(func, '__name__', func))
+        raise
+    finally:
+        connections.close_all()
+
+
+def submit(func, *args, **kwargs):
+    if getattr(settings, 'DASHBOARD_BACKGROUND_INLINE', False):
+        return func(*args, **kwargs)
+    return get_executor().submit(_run, func, args, kwargs)
+
+
+def submit_on_commit(func, *args, **kwargs):
+    """Run ``func`` in the background after the current transaction commits."""
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
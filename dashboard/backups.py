@@ -0,0 +1,212 @@
+import gzip
+import io
+import json
+
+from django.apps import apps
+from django.core import serializers
+from django.core.cache import cache
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Prefetch
+
+from . import hierarchy, media, search, stats
+from .streams import text_stream
+
+
+BACKUP_CHUNK_SIZE = 2000
+RESTORE_BATCH_SIZE = 1000
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Rebuilt from the tables after a restore instead of being backed up.
+DERIVED_MODELS = {'dashboard.taskstats', 'dashboard.taskduedatebucket', 'dashboard.mediablob'}
+# Created by migrate, or not worth keeping across a restore.
+SKIPPED_MODELS = {'contenttypes.contenttype', 'auth.permission', 'sessions.session', 'admin.logentry'}
+
+
+def backup_models(app_labels=('auth', 'dashboard')):
+    """Concrete models to back up, parents before the models that point at them."""
+    app_list = [(apps.get_app_config(label), None) for label in app_labels]
+    return [
+        model for model in serializers.sort_dependencies(app_list)
+        if model._meta.label_lower not in DERIVED_MODELS | SKIPPED_MODELS and not model._meta.proxy
+    ]
+
+
+# ---------------- Backup ----------------
+def iter_model_records(model, chunk_size=BACKUP_CHUNK_SIZE):
+    """
+    Yield ``dumpdata``-style dicts for every row of ``model``.
+
+    Rows are read in primary-key ranges with their many-to-many ids prefetched,
+    so one chunk is in memory at a time and there is no query per object.
+    """
+    queryset = model._default_manager.order_by('pk').prefetch_related(*[
+        Prefetch(field.name, queryset=field.related_model._default_manager.only('pk'))
+        for field in model._meta.local_many_to_many
+    ])
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        yield from serializers.serialize('python', chunk)
+        last_pk = chunk[-1].pk
+
+
+def write_backup(fp, models=None, chunk_size=BACKUP_CHUNK_SIZE):
+    """Write one JSON object per line to text stream ``fp``; returns ``{label: count}``."""
+    counts = {}
+    for model in models or backup_models():
+        count = 0
+        for record in iter_model_records(model, chunk_size):
+            fp.write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False))
+            fp.write('\n')
+            count += 1
+        counts[model._meta.label] = count
+    return counts
+
+
+def open_backup(path, mode='rb', compress=None):
+    """Open ``path`` as text, gzip-compressed when asked to (writing) or when it is (reading)."""
+    if 'w' in mode:
+        compress = path.endswith('.gz') if compress is None else compress
+        binary = gzip.open(path, 'wb') if compress else open(path, 'wb')
+        return io.TextIOWrapper(binary, encoding='utf-8', newline='\n')
+    binary = open(path, 'rb')
+    if binary.read(2) == GZIP_MAGIC:
+        binary.close()
+        binary = gzip.open(path, 'rb')
+    else:
+        binary.seek(0)
+    return text_stream(binary)
+
+
+# ---------------- Restore ----------------
+class RestoreResult:
+    def __init__(self):
+        self.counts = {}
+        self.skipped = 0
+        self.truncated = False
+
+
+class _ModelBatch:
+    """Objects of one model waiting for bulk_create, plus their many-to-many rows."""
+
+    def __init__(self, model):
+        self.model = model
+        self.objects = []
+        self.m2m = []
+
+    def add(self, deserialized):
+        self.objects.append(deserialized.object)
+        for name, target_pks in (deserialized.m2m_data or {}).items():
+            field = self.model._meta.get_field(name)
+            through = field.remote_field.through
+            source, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+            self.m2m.extend(
+                (through, through(**{source: deserialized.object.pk, target: target_pk}))
+                for target_pk in target_pks
+            )
+
+    def flush(self, ignore_conflicts):
+        if self.objects:
+            self._insert(ignore_conflicts)
+        by_through = {}
+        for through, row in self.m2m:
+            by_through.setdefault(through, []).append(row)
+        for through, rows in by_through.items():
+            through.objects.bulk_create(rows, ignore_conflicts=ignore_conflicts)
+        count = len(self.objects)
+        self.objects, self.m2m = [], []
+        return count
+
+    def _insert(self, ignore_conflicts):
+        # bulk_create runs pre_save(add=True), which stamps auto_now/auto_now_add
+        # fields with the current time; the backed-up values are written back after.
+        manager = self.model._base_manager
+        stamped = [
+            field for field in self.model._meta.concrete_fields
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+        ]
+        saved = [{field.attname: getattr(obj, field.attname) for field in stamped} for obj in self.objects]
+        existing = set()
+        if stamped and ignore_conflicts:
+            existing = set(manager.filter(pk__in=[obj.pk for obj in self.objects]).values_list('pk', flat=True))
+        manager.bulk_create(self.objects, ignore_conflicts=ignore_conflicts)
+        if not stamped:
+            return
+        restored = []
+        for obj, values in zip(self.objects, saved):
+            values = {name: value for name, value in values.items() if value is not None}
+            if values and obj.pk not in existing:
+                for name, value in values.items():
+                    setattr(obj, name, value)
+                restored.append(obj)
+        if restored:
+            manager.bulk_update(restored, [field.name for field in stamped])
+
+
+def restore_records(records, batch_size=RESTORE_BATCH_SIZE, ignore_conflicts=False, allow_truncated=False):
+    """
+    Insert ``dumpdata``-style records (e.g. from iter_json_records) with bulk_create.
+
+    Records are grouped into per-model batches in file order, so the dependency
+    order of the backup is kept. Fields that no longer exist are ignored, which
+    lets old dumps load. bulk_create skips signals, so the derived tables (task
+    stats, search index, media reference counts) are rebuilt at the end.
+    """
+    result = RestoreResult()
+    restored_models = set()
+    batch = None
+    if allow_truncated:
+        records = _until_truncated(records, result)
+    with transaction.atomic():
+        for record in records:
+            if record.get('model', '').lower() in SKIPPED_MODELS | DERIVED_MODELS:
+                result.skipped += 1
+                continue
+            for deserialized in serializers.deserialize('python', [record], ignorenonexistent=True):
+                model = type(deserialized.object)
+                if batch is None or batch.model is not model:
+                    if batch is not None:
+                        _count(result, batch.model, batch.flush(ignore_conflicts))
+                    batch = _ModelBatch(model)
+                    restored_models.add(model)
+                batch.add(deserialized)
+                if len(batch.objects) >= batch_size:
+                    _count(result, model, batch.flush(ignore_conflicts))
+        if batch is not None:
+            _count(result, batch.model, batch.flush(ignore_conflicts))
+
+        reset_sequences(restored_models)
+        stats.rebuild()
+        media.recount()
+        hierarchy.rebuild()
+    if search.fts_enabled():
+        search.rebuild_index()
+    # Cached unread counts and profile summaries may describe the old rows.
+    cache.clear()
+    return result
+
+
+def _until_truncated(records, result):
+    # iter_json_records raises ValueError when the file stops mid-array; keep what was read.
+    try:
+        yield from records
+    except ValueError:
+        result.truncated = True
+
+
+def _count(result, model, count):
+    result.counts[model._meta.label] = result.counts.get(model._meta.label, 0) + count
+
+
+def reset_sequences(models):
+    """Move auto-increment sequences past the restored primary keys (a no-op on SQLite)."""
+    statements = connection.ops.sequence_reset_sql(no_style(), list(models))
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
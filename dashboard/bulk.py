@@ -0,0 +1,54 @@
+from django.db import transaction
+
+from . import activity, fragments, stats
+from .models import Employee, Task
+
+
+MAX_BULK_TASKS = 5000
+Assignment = Task.assigned_employees.through
+
+
+# ---------------- Bulk Task Changes ----------------
+@transaction.atomic
+def apply_bulk_task_changes(task_ids, status=None, assign=(), unassign=(), actor=None):
+    """
+    Change status and assignees for many tasks with set-based statements.
+
+    One UPDATE for the status, one DELETE for removed assignees and one
+    multi-row INSERT into the m2m through table for added ones, all in a
+    single transaction, plus one multi-row INSERT into the activity log.
+    Unknown task or employee ids are ignored.
+    """
+    task_ids = list(Task.objects.filter(pk__in=task_ids).values_list('id', flat=True))
+    result = {'tasks': len(task_ids), 'status_updated': 0, 'assigned': 0, 'unassigned': 0}
+    if not task_ids:
+        return result
+    tasks = Task.objects.filter(pk__in=task_ids)
+
+    if status:
+        stats.apply_bulk_status_change(tasks, status)
+        activity.record_bulk_change(tasks, status, actor.pk if actor is not None else None)
+        result['status_updated'] = tasks.exclude(status=status).update(status=status)
+
+    if unassign:
+        result['unassigned'], _ = Assignment.objects.filter(
+            task_id__in=task_ids, employee_id__in=unassign
+        ).delete()
+
+    if assign:
+        employee_ids = list(Employee.objects.filter(pk__in=assign).values_list('id', flat=True))
+        existing = set(Assignment.objects.filter(
+            task_id__in=task_ids, employee_id__in=employee_ids
+        ).values_list('task_id', 'employee_id'))
+        new_links = [
+            Assignment(task_id=task_id, employee_id=employee_id)
+            for task_id in task_ids for employee_id in employee_ids
+            if (task_id, employee_id) not in existing
+        ]
+        Assignment.objects.bulk_create(new_links, batch_size=1000, ignore_conflicts=True)
+        result['assigned'] = len(new_links)
+
+    # The through-table statements send no m2m_changed signals.
+    stats.adjust(assignment_count=result['assigned'] - result['unassigned'])
+    fragments.bump(fragments.TASKS)
+    return result
@@ -0,0 +1,17 @@
+from . import notifications, profiles
+
+
+def unread_notifications(request):
+    """Unread badge for base.html; only counted when a template actually renders it."""
+    def count():
+        user = request.user
+        return notifications.unread_count(user.pk) if user.is_authenticated else 0
+    return {'unread_notification_count': count}
+
+
+def user_profile(request):
+    """Cached role/name/picture of the signed-in user, so base.html avoids a Profile query per page."""
+    def summary():
+        user = request.user
+        return profiles.profile_summary(user.pk) if user.is_authenticated else {}
+    return {'user_profile': summary}
@@ -0,0 +1,42 @@
+import functools
+import logging
+import time
+
+from django.db import OperationalError, connection, transaction
+
+
+logger = logging.getLogger(__name__)
+
+LOCK_RETRIES = 3
+LOCK_RETRY_DELAY = 0.1
+
+
+# ---------------- SQLite Lock Contention ----------------
+def is_lock_error(error):
+    return 'database is locked' in str(error) or 'database table is locked' in str(error)
+
+
+def retry_on_locked(view):
+    """
+    Run a writing view in one transaction, retrying it when SQLite reports a lock.
+
+    The busy timeout already makes writers wait for each other; this covers the
+    rare case where that wait runs out under heavy load. Safe requests are passed
+    straight through, and nothing is retried inside an outer transaction (tests,
+    ATOMIC_REQUESTS) because the outer block is already broken at that point.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return view(request, *args, **kwargs)
+        attempts = LOCK_RETRIES if not connection.in_atomic_block else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                with transaction.atomic():
+                    return view(request, *args, **kwargs)
+            except OperationalError as e:
+                if attempt == attempts or not is_lock_error(e):
+                    raise
+                logger.warning("Database locked in %s, retrying (%d/%d)", view.__name__, attempt, attempts)
+                time.sleep(LOCK_RETRY_DELAY * attempt)
+    return wrapper
@@ -0,0 +1,191 @@
+import itertools
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from . import activity, fragments, hierarchy, search, stats
+from .models import Employee, Notification, Profile, Task
+
+
+DEMO_BATCH_SIZE = 1000
+DEMO_PASSWORD = 'demo-password'
+Assignment = Task.assigned_employees.through
+
+FIRST_NAMES = [
+    'Aarav', 'Amelia', 'Chen', 'Diego', 'Fatima', 'Hannah', 'Ivan', 'Kofi', 'Leila', 'Mateo',
+    'Mei', 'Noah', 'Olga', 'Priya', 'Rahul', 'Sara', 'Tomás', 'Yuki', 'Zanele', 'Zoe',
+]
+LAST_NAMES = [
+    'Ahmed', 'Costa', 'Dubois', 'García', 'Ivanova', 'Kim', 'Kowalski', 'Mensah', 'Müller', 'Nakamura',
+    'Nguyen', 'Okafor', 'Patel', 'Rossi', 'Silva', 'Smith', 'Singh', 'Wang', 'Yilmaz', 'Zhang',
+]
+VERBS = ['Review', 'Update', 'Prepare', 'Fix', 'Migrate', 'Audit', 'Draft', 'Test', 'Deploy', 'Document']
+SUBJECTS = [
+    'quarterly report', 'onboarding checklist', 'invoice export', 'login page', 'payroll sheet',
+    'customer survey', 'release notes', 'backup schedule', 'vendor contract', 'sales dashboard',
+    'support rota', 'API client', 'training plan', 'office inventory', 'security policy',
+]
+DETAILS = [
+    'Coordinate with the team lead before starting.',
+    'Attach the final version to the shared drive.',
+    'Check the numbers against last month.',
+    'Keep the customer informed about progress.',
+    'Flag anything blocking in the weekly meeting.',
+    'Follow the style guide for all documents.',
+    'Ask finance to sign off once done.',
+]
+ROLE_WEIGHTS = [('employee', 85), ('manager', 12), ('admin', 3)]
+# Roughly what a live board looks like: most work open, a long tail completed.
+STATUS_WEIGHTS = [(Task.STATUS_PENDING, 45), (Task.STATUS_IN_PROGRESS, 30), (Task.STATUS_COMPLETED, 25)]
+
+
+class DemoResult:
+    def __init__(self):
+        self.users = 0
+        self.tasks = 0
+        self.assignments = 0
+        self.notifications = 0
+
+
+def _weighted(rng, weights):
+    values, shares = zip(*weights)
+    return rng.choices(values, weights=shares)[0]
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+# ---------------- People ----------------
+def create_people(count, rng, prefix, password, batch_size):
+    """
+    Insert ``count`` users with a Profile and an Employee each.
+
+    Managers report to an admin and employees to a manager or admin created
+    before them, which gives a few levels of org tree. Returns ``(user_ids,
+    employee_ids, manager_ids)``, the last being the users with a manager or
+    admin role who hand out the generated tasks.
+    """
+    user_ids, employee_ids, manager_ids, admin_ids = [], [], [], []
+    for batch in _batches(range(count), batch_size):
+        people = []
+        for _ in batch:
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            username = f'{prefix}.{get_random_string(10).lower()}'
+            people.append((f'{first} {last}', f'{username}@example.com', username, _weighted(rng, ROLE_WEIGHTS)))
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=username, email=email, first_name=name.split()[0], last_name=name.split()[1],
+                     password=password)
+                for name, email, username, _ in people
+            ])
+            Profile.objects.bulk_create([
+                Profile(user=user, name=name, phone=f'+1555{rng.randrange(10 ** 6):06d}', role=role, email=email)
+                for user, (name, email, _, role) in zip(users, people)
+            ])
+            employees = []
+            for user, (name, email, _, role) in zip(users, people):
+                bosses = admin_ids if role == 'manager' else manager_ids if role == 'employee' else []
+                employees.append(Employee(
+                    user=user, name=name, email=email, phone=f'+1555{rng.randrange(10 ** 6):06d}', role=role,
+                    manager_id=rng.choice(bosses) if bosses else None,
+                ))
+                if role != 'employee':
+                    manager_ids.append(user.pk)
+                if role == 'admin':
+                    admin_ids.append(user.pk)
+            Employee.objects.bulk_create(employees)
+        user_ids.extend(user.pk for user in users)
+        employee_ids.extend(employee.pk for employee in employees)
+    return user_ids, employee_ids, manager_ids
+
+
+# ---------------- Tasks ----------------
+def _task(rng, manager_ids, today):
+    due_date = None if rng.random() < 0.1 else today + timedelta(days=rng.randint(-60, 90))
+    return Task(
+        title=f'{rng.choice(VERBS)} {rng.choice(SUBJECTS)}',
+        description=' '.join(rng.sample(DETAILS, rng.randint(1, 3))),
+        due_date=due_date,
+        status=_weighted(rng, STATUS_WEIGHTS),
+        assigned_by_id=rng.choice(manager_ids) if manager_ids else None,
+        alert_all=rng.random() < 0.05,
+    )
+
+
+def create_tasks(count, rng, employee_ids, manager_ids, max_assignees, batch_size, result):
+    """Insert tasks with 1..``max_assignees`` employees each; returns the new task ids."""
+    today = timezone.now().date()
+    task_ids = []
+    for batch in _batches(range(count), batch_size):
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create([_task(rng, manager_ids, today) for _ in batch])
+            links = []
+            for task in tasks:
+                if employee_ids and max_assignees:
+                    picked = rng.sample(employee_ids, min(len(employee_ids), rng.randint(1, max_assignees)))
+                    links.extend(Assignment(task_id=task.pk, employee_id=pk) for pk in picked)
+            Assignment.objects.bulk_create(links)
+            search.index_tasks((task.pk, task.title, task.description) for task in tasks)
+            activity.record_created(tasks)
+        task_ids.extend(task.pk for task in tasks)
+        result.assignments += len(links)
+    return task_ids
+
+
+def create_notifications(user_ids, task_ids, per_user, rng, batch_size):
+    now = timezone.now()
+
+    def rows():
+        for user_id in user_ids:
+            for _ in range(per_user):
+                task_id = rng.choice(task_ids) if task_ids else None
+                yield Notification(
+                    user_id=user_id,
+                    task_id=task_id,
+                    message=f'A task has been {rng.choice(["created", "updated"])} by the demo generator.',
+                    is_read=rng.random() < 0.6,
+                    timestamp=now - timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+                )
+
+    created = 0
+    for batch in _batches(rows(), batch_size):
+        with transaction.atomic():
+            Notification.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def generate(users=100, tasks=1000, max_assignees=3, notifications_per_user=5, seed=None,
+             prefix='demo', batch_size=DEMO_BATCH_SIZE, password=DEMO_PASSWORD):
+    """
+    Fill the database with synthetic users, employees, tasks, assignments and notifications.
+
+    Everything is written with bulk_create in ``batch_size`` chunks, and one
+    password hash is shared by all demo users, so generating tens of thousands
+    of rows takes seconds. The same ``seed`` reproduces the same data shape.
+    The TaskStats counters and org paths are rebuilt and the cached fragments
+    bumped at the end because bulk inserts send no signals.
+    """
+    rng = random.Random(seed)
+    result = DemoResult()
+    hashed = make_password(password)
+
+    user_ids, employee_ids, manager_ids = create_people(users, rng, prefix, hashed, batch_size)
+    result.users = len(user_ids)
+
+    task_ids = create_tasks(tasks, rng, employee_ids, manager_ids or user_ids[:1], max_assignees, batch_size, result)
+    result.tasks = len(task_ids)
+    result.notifications = create_notifications(user_ids, task_ids, notifications_per_user, rng, batch_size)
+
+    stats.rebuild()
+    hierarchy.rebuild(batch_size)
+    fragments.bump(fragments.TASKS, fragments.EMPLOYEES)
+    return result
@@ -0,0 +1,65 @@
+from django.contrib.auth.models import User
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Employee, Task
+
+
+USERS_PER_PAGE = 50
+DEFAULT_SORT = 'username'
+# Sort key -> ORDER BY expression; every key sorts both ways with a leading '-'.
+SORTS = {
+    'username': 'username',
+    'email': 'email',
+    'role': 'role',
+    'joined': 'date_joined',
+    'last_login': 'last_login',
+    'employees': 'employee_count',
+    'tasks': 'assigned_task_count',
+}
+
+
+def count_of(queryset, field):
+    """Correlated ``COUNT(*)`` of ``queryset`` rows whose ``field`` is the outer row; 0 when none."""
+    counted = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def annotated_users():
+    """
+    Users with their profile role, the employees they manage and the tasks they handed out.
+
+    Each count is its own correlated subquery over an indexed foreign key, so
+    the two to-many relations never multiply each other's rows and a page of
+    users is one query however many users, employees or tasks there are.
+    """
+    return User.objects.annotate(
+        role=F('profile__role'),
+        employee_count=count_of(Employee.objects.all(), 'manager'),
+        assigned_task_count=count_of(Task.objects.all(), 'assigned_by'),
+    )
+
+
+def parse_sort(value):
+    """Return ``(key, descending)`` for a ``sort`` parameter, falling back to the default."""
+    value = value or DEFAULT_SORT
+    descending = value.startswith('-')
+    key = value.lstrip('-')
+    if key not in SORTS:
+        return DEFAULT_SORT, False
+    return key, descending
+
+
+def user_directory(search='', sort=None):
+    queryset = annotated_users()
+    search = search.strip()
+    if search:
+        queryset = queryset.filter(
+            Q(username__icontains=search) | Q(email__icontains=search)
+            | Q(first_name__icontains=search) | Q(last_name__icontains=search)
+            | Q(profile__name__icontains=search)
+        )
+    key, descending = parse_sort(sort)
+    ordering = F(SORTS[key]).desc(nulls_last=True) if descending else F(SORTS[key]).asc(nulls_last=True)
+    # The primary key breaks ties so rows never repeat or vanish between pages.
+    return queryset.order_by(ordering, 'pk')
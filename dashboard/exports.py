@@ -0,0 +1,111 @@
+import codecs
+import csv
+
+from django.db.models import Aggregate, Count, OuterRef, Subquery, TextField, Value
+
+from .models import Employee, Task
+
+
+EXPORT_CHUNK_SIZE = 2000
+ASSIGNEE_SEPARATOR = '; '
+Assignment = Task.assigned_employees.through
+
+TASK_COLUMNS = ['ID', 'Title', 'Description', 'Status', 'Due date', 'Assigned by', 'Assigned to', 'Created at']
+EMPLOYEE_COLUMNS = ['ID', 'Name', 'Email', 'Phone', 'Role', 'Username', 'Tasks']
+# Spreadsheet apps evaluate cells starting with these as formulas.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class GroupConcat(Aggregate):
+    """Join the non-null values of a group into one string: GROUP_CONCAT on SQLite, STRING_AGG on PostgreSQL."""
+    function = 'GROUP_CONCAT'
+    output_field = TextField()
+
+    def __init__(self, expression, separator=ASSIGNEE_SEPARATOR, **extra):
+        super().__init__(expression, Value(separator), **extra)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='STRING_AGG', **extra_context)
+
+
+# ---------------- Querysets ----------------
+def assignee_names():
+    """
+    Correlated subquery with the names of a task's assignees in one string.
+
+    A subquery rather than annotating the m2m join keeps the names complete
+    when the outer queryset is itself filtered by assignee.
+    """
+    return Subquery(
+        Assignment.objects.filter(task_id=OuterRef('pk'))
+        .order_by().values('task_id')
+        .annotate(names=GroupConcat('employee__name'))
+        .values('names')
+    )
+
+
+def task_rows(queryset):
+    statuses = dict(Task.STATUS_CHOICES)
+    rows = (
+        queryset.annotate(assignee_names=assignee_names())
+        .order_by('id')
+        .values_list('id', 'title', 'description', 'status', 'due_date', 'assigned_by__username',
+                     'assignee_names', 'created_at')
+    )
+    for pk, title, description, status, due_date, assigned_by, assignees, created_at in rows.iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        yield [pk, title, description, statuses.get(status, status), due_date, assigned_by, assignees,
+               created_at.strftime('%Y-%m-%d %H:%M')]
+
+
+def employee_rows(queryset):
+    rows = (
+        queryset.annotate(task_count=Count('tasks'))
+        .order_by('id')
+        .values_list('id', 'name', 'email', 'phone', 'role', 'user__username', 'task_count')
+    )
+    return rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+# ---------------- CSV Encoding ----------------
+class _Echo:
+    """File-like object whose write() hands back the line, so csv.writer can feed a generator."""
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(header, rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield UTF-8 CSV bytes for ``rows``, ``chunk_size`` lines at a time.
+
+    Starts with a byte-order mark so Excel opens accented names correctly, and
+    defuses cells that a spreadsheet would run as a formula. Only one chunk of
+    lines is held in memory however long ``rows`` is.
+    """
+    writer = csv.writer(_Echo())
+    yield codecs.BOM_UTF8 + writer.writerow(header).encode()
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow([_cell(value) for value in row]))
+        if len(lines) >= chunk_size:
+            yield ''.join(lines).encode()
+            lines = []
+    if lines:
+        yield ''.join(lines).encode()
+
+
+def export_tasks(queryset=None):
+    return iter_csv(TASK_COLUMNS, task_rows(Task.objects.all() if queryset is None else queryset))
+
+
+def export_employees(queryset=None):
+    return iter_csv(EMPLOYEE_COLUMNS, employee_rows(Employee.objects.all() if queryset is None else queryset))
@@ -1,5 +1,7 @@
 from django import forms  # type: ignore
+from . import hierarchy
 from .models import Employee, Profile, Task
+from .widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
 # ---------------- Add Employee Form ----------------
@@ -9,12 +11,20 @@ class AddEmployeeForm(forms.ModelForm):
         fields = ['profile_picture', 'name', 'email', 'phone', 'role']
 
 
+# ---------------- Employee Import Form ----------------
+class EmployeeImportForm(forms.Form):
+    file = forms.FileField(
+        help_text='CSV with name, email, phone and role columns, or a JSON array / JSON Lines file.',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.json,.jsonl'})
+    )
+
+
 # ---------------- Task Form ----------------
 class TaskForm(forms.ModelForm):
     assigned_employees = forms.ModelMultipleChoiceField(
-        queryset=Employee.objects.all(),
-        widget=forms.SelectMultiple(attrs={
-            'class': 'form-control select2',
+        queryset=Employee.objects.only('id', 'name', 'email'),
+        widget=AutocompleteSelectMultiple('employee_autocomplete', attrs={
+            'class': 'form-control',
             'style': 'width: 100%'
         }),
         required=False,
@@ -40,3 +50,47 @@ class EmployeeForm(forms.ModelForm):
     class Meta:
         model = Employee
         fields = '__all__'
+
+    def clean_manager(self):
+        manager = self.cleaned_data.get('manager')
+        if manager and hierarchy.would_cycle(self.instance.pk, manager.pk):
+            raise forms.ValidationError("This manager reports to the employee, directly or indirectly.")
+        return manager
+
+
+# ---------------- Task Filter Form ----------------
+class TaskFilterForm(forms.Form):
+    status = forms.ChoiceField(
+        choices=[('', 'Any status')] + Task.STATUS_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    due_from = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
+    )
+    due_to = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
+    )
+    assignee = forms.ModelChoiceField(
+        queryset=Employee.objects.only('id', 'name', 'email'),
+        required=False,
+        empty_label='Anyone',
+        widget=AutocompleteSelect('employee_autocomplete', attrs={'class': 'form-select'})
+    )
+
+    def filter_queryset(self, queryset):
+        """Narrow ``queryset`` by whichever filters were submitted and are valid."""
+        if not self.is_bound or not self.is_valid():
+            return queryset
+        data = self.cleaned_data
+        if data['status']:
+            queryset = queryset.filter(status=data['status'])
+        if data['due_from']:
+            queryset = queryset.filter(due_date__gte=data['due_from'])
+        if data['due_to']:
+            queryset = queryset.filter(due_date__lte=data['due_to'])
+        if data['assignee']:
+            queryset = queryset.filter(assigned_employees=data['assignee'])
+        return queryset
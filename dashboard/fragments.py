@@ -0,0 +1,56 @@
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+
+
+VERSION_KEY = 'fragments:version:{}'
+TASKS = 'tasks'
+EMPLOYEES = 'employees'
+
+
+# ---------------- Fragment Cache Versions ----------------
+# Cached page fragments ({% cache %} blocks in the dashboard, All Tasks and
+# Employee List templates) include the version of the data they show in their
+# key. dashboard.signals and the bulk paths bump a version whenever that data
+# changes, so the next render misses and nothing stale is ever served; old
+# entries simply age out of the cache.
+
+def versions(*names):
+    """One token for the current version of every data set in ``names``."""
+    keys = [VERSION_KEY.format(name) for name in names]
+    current = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in current}
+    if missing:
+        cache.set_many(missing, None)
+        current.update(missing)
+    return '-'.join(current[key] for key in keys)
+
+
+def bump(*names):
+    """Invalidate every fragment built from ``names``."""
+    def new_versions():
+        cache.set_many({VERSION_KEY.format(name): uuid.uuid4().hex for name in names}, None)
+    # Now, so this request's redirect target is fresh, and again after commit, so
+    # a fragment another request rendered from the pre-commit rows is discarded too.
+    new_versions()
+    transaction.on_commit(new_versions)
+
+
+def fragment_context(*names):
+    return {
+        'fragment_version': versions(*names),
+        'fragment_timeout': getattr(settings, 'DASHBOARD_FRAGMENT_CACHE_TIMEOUT', 600),
+    }
+
+
+async def afragment_context(*names):
+    return await sync_to_async(fragment_context)(*names)
+
+
+async def ais_cached(fragment_name, *vary_on):
+    """Whether the {% cache fragment_name ... %} block is already stored, so its data need not be fetched."""
+    return await cache.ahas_key(make_template_fragment_key(fragment_name, vary_on))
@@ -0,0 +1,223 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Case, CharField, Count, F, Func, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Concat, Left, Length, Substr
+
+from .models import Employee, Task
+
+
+logger = logging.getLogger(__name__)
+
+Assignment = Task.assigned_employees.through
+ROOT = '/'
+OPEN_STATUSES = [Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS]
+
+
+# ---------------- Materialized Org Paths ----------------
+# Employee.manager points at a User; that user's own employee row (the lowest
+# pk if there are several) is the parent in the org tree. Every employee stores
+# the ids from the root down to itself as org_path, e.g. '/3/17/42/', so a
+# whole subtree is the index range [path, path with its trailing '/' replaced
+# by '0'): '/' sorts just below '0' and nothing outside the subtree falls in
+# between. This needs byte-wise string comparison, as SQLite does by default.
+
+def child_path(parent_path, pk):
+    return f'{parent_path or ROOT}{pk}/'
+
+
+def subtree_bounds(path):
+    return path, path[:-1] + '0'
+
+
+def in_subtree(path, prefix=''):
+    """Q for rows (or, with ``prefix='employee__'``, related rows) inside the subtree at ``path``."""
+    low, high = subtree_bounds(path)
+    return Q(**{f'{prefix}org_path__gte': low, f'{prefix}org_path__lt': high})
+
+
+def path_ids(path):
+    return [int(part) for part in path.strip('/').split('/') if part]
+
+
+def parent_of(employee_id, manager_id):
+    """``(pk, org_path)`` of the employee row behind ``manager_id``, or ``None`` for a root."""
+    if manager_id is None:
+        return None
+    return (
+        Employee.objects.filter(user_id=manager_id).exclude(pk=employee_id)
+        .order_by('pk').values_list('pk', 'org_path').first()
+    )
+
+
+def would_cycle(employee_id, manager_id):
+    """True if reporting to the user ``manager_id`` would put the employee below itself."""
+    if employee_id is None or manager_id is None:
+        return False
+    parent = parent_of(employee_id, manager_id)
+    if parent is None:
+        return False
+    stored = Employee.objects.filter(pk=employee_id).values_list('org_path', flat=True).first()
+    return bool(stored) and parent[1].startswith(stored)
+
+
+def place(employee_id, _placing=None):
+    """
+    Recompute one employee's org_path from its manager; returns the new path.
+
+    The employee and everything below it are moved with a single UPDATE that
+    swaps the old path prefix for the new one. A parent that has no path yet
+    (e.g. created with bulk_create) is placed first. A manager that would make
+    a cycle is ignored and the employee becomes a root.
+    """
+    _placing = _placing or set()
+    _placing.add(employee_id)
+    row = Employee.objects.filter(pk=employee_id).values_list('org_path', 'manager_id').first()
+    if row is None:
+        return None
+    old, manager_id = row
+
+    parent = parent_of(employee_id, manager_id)
+    parent_path = ROOT
+    if parent is not None:
+        parent_pk, parent_path = parent
+        if not parent_path and parent_pk not in _placing:
+            parent_path = place(parent_pk, _placing)
+        if not parent_path or (old and parent_path.startswith(old)):
+            logger.warning("Employee %s cannot report to employee %s without a cycle; placed at the root.",
+                           employee_id, parent_pk)
+            parent_path = ROOT
+    new = child_path(parent_path, employee_id)
+    if new == old:
+        return new
+
+    with transaction.atomic():
+        if old:
+            Employee.objects.filter(in_subtree(old)).update(
+                org_path=Concat(Value(new), Substr('org_path', len(old) + 1), output_field=CharField())
+            )
+        else:
+            Employee.objects.filter(pk=employee_id).update(org_path=new)
+    return new
+
+
+def place_reports_of(user_ids):
+    """Re-place the employees managed by ``user_ids``, e.g. after their employee row changed hands."""
+    for pk in Employee.objects.filter(manager_id__in=[uid for uid in user_ids if uid]).values_list('pk', flat=True):
+        place(pk)
+
+
+def direct_reports(employee):
+    """Ids of the employees one level below ``employee`` in the stored tree."""
+    if not employee.org_path or employee.user_id is None:
+        return []
+    # Through the manager index; the subtree range drops reports placed under another row of the same user.
+    return list(
+        Employee.objects.filter(in_subtree(employee.org_path), manager_id=employee.user_id)
+        .exclude(pk=employee.pk).values_list('pk', flat=True)
+    )
+
+
+def place_roots(employee_ids):
+    """Give bulk-created employees without a manager their root path, in one UPDATE."""
+    Employee.objects.filter(pk__in=employee_ids, manager__isnull=True, org_path='').update(
+        org_path=Concat(Value(ROOT), Cast('pk', CharField()), Value('/'), output_field=CharField())
+    )
+
+
+# ---------------- Rebuild ----------------
+def compute_paths(rows):
+    """
+    Map each employee pk to its org path, given ``(pk, user_id, manager_id)`` rows.
+
+    Employees whose manager has no employee row are roots; a cycle is broken by
+    making one of its members a root.
+    """
+    rows = sorted(rows)
+    primary = {}
+    for pk, user_id, _ in rows:
+        if user_id is not None:
+            primary.setdefault(user_id, pk)
+    parents = {}
+    for pk, _, manager_id in rows:
+        parent = primary.get(manager_id)
+        parents[pk] = None if parent == pk else parent
+
+    paths = {}
+    for pk in parents:
+        chain, on_chain, node = [], set(), pk
+        while node is not None and node not in paths and node not in on_chain:
+            chain.append(node)
+            on_chain.add(node)
+            node = parents[node]
+        base = paths[node] if node is not None and node in paths else ROOT
+        for member in reversed(chain):
+            paths[member] = base = child_path(base, member)
+    return paths
+
+
+def rebuild(batch_size=1000):
+    """Recompute every org_path from Employee.manager; returns the number of rows corrected."""
+    rows = Employee.objects.values_list('pk', 'user_id', 'manager_id').iterator(chunk_size=batch_size * 10)
+    paths = compute_paths(rows)
+    stale = [
+        Employee(pk=pk, org_path=paths[pk])
+        for pk, current in Employee.objects.values_list('pk', 'org_path').iterator(chunk_size=batch_size * 10)
+        if pk in paths and paths[pk] != current
+    ]
+    with transaction.atomic():
+        Employee.objects.bulk_update(stale, ['org_path'], batch_size=batch_size)
+    return len(stale)
+
+
+# ---------------- Team Queries ----------------
+def count_of(queryset, expression=F('pk'), distinct=False):
+    """Scalar subquery counting ``queryset``; with no GROUP BY it can be correlated through OuterRef."""
+    extra = {'template': '%(function)s(DISTINCT %(expressions)s)'} if distinct else {}
+    counted = queryset.order_by().annotate(n=Func(expression, function='COUNT', **extra)).values('n')
+    return Subquery(counted, output_field=IntegerField())
+
+
+def subtree_upper(path_expression):
+    """SQL twin of subtree_bounds()[1] for an org_path column or OuterRef."""
+    return Concat(Left(path_expression, Length(path_expression) - 1), Value('0'), output_field=CharField())
+
+
+def team_tasks(employee):
+    """Tasks assigned to anyone in ``employee``'s subtree, each once."""
+    return Task.objects.filter(
+        id__in=Assignment.objects.filter(in_subtree(employee.org_path, 'employee__')).values('task_id')
+    )
+
+
+def team_summary(employee, today):
+    """Subtree task counts in a single query."""
+    open_ = Q(status__in=OPEN_STATUSES)
+    return team_tasks(employee).aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status=Task.STATUS_PENDING)),
+        in_progress=Count('id', filter=Q(status=Task.STATUS_IN_PROGRESS)),
+        completed=Count('id', filter=Q(status=Task.STATUS_COMPLETED)),
+        overdue=Count('id', filter=open_ & Q(due_date__lt=today)),
+    )
+
+
+def report_breakdown(employee):
+    """The employee's direct reports, each with its own subtree head count and open task count."""
+    if employee.user_id is None:
+        return Employee.objects.none()
+    members = Employee.objects.filter(
+        org_path__gte=OuterRef('org_path'), org_path__lt=subtree_upper(OuterRef('org_path'))
+    )
+    subtree_assignments = Assignment.objects.filter(
+        employee__org_path__gte=OuterRef('org_path'),
+        employee__org_path__lt=subtree_upper(OuterRef('org_path')),
+    )
+    # The status test sits inside the COUNT rather than the WHERE clause so the
+    # planner drives the subquery from the org_path range, not from every open task.
+    open_task = Case(When(task__status__in=OPEN_STATUSES, then=F('task_id')))
+    return (
+        Employee.objects.filter(manager_id=employee.user_id).exclude(pk=employee.pk).exclude(org_path='')
+        .annotate(headcount=count_of(members), open_task_count=count_of(subtree_assignments, open_task, distinct=True))
+        .order_by('name', 'pk')
+    )
@@ -0,0 +1,221 @@
+import csv
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils.crypto import get_random_string
+
+from . import fragments, hierarchy, outbox, stats
+from .models import ROLE_CHOICES, Employee, OutboundEmail, Profile
+from .streams import iter_json_records
+
+
+IMPORT_BATCH_SIZE = 500
+ROLES = {value for value, _ in ROLE_CHOICES}
+WELCOME_SUBJECT = 'Welcome to TaskPro'
+
+
+def welcome_message(name, email, password):
+    return f"Hello {name},\n\nYour account has been created.\nUsername: {email}\nPassword: {password}"
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    def error(self, row_number, message):
+        self.errors.append((row_number, message))
+
+
+# ---------------- Readers ----------------
+def read_records(fp, fmt):
+    """Yield employee dicts from a CSV or JSON / JSON Lines text stream without loading it whole."""
+    if fmt == 'csv':
+        return csv.DictReader(fp)
+    if fmt == 'json':
+        return iter_json_records(fp)
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def guess_format(filename):
+    return 'csv' if filename.lower().endswith('.csv') else 'json'
+
+
+def limit_rows(records, max_rows):
+    """Read at most ``max_rows`` records; a longer file raises ValueError pointing at the command."""
+    rows = list(itertools.islice(records, max_rows + 1))
+    if len(rows) > max_rows:
+        raise ValueError(f"Files over {max_rows} rows must be imported with `manage.py import_employees`.")
+    return rows
+
+
+# ---------------- Validation ----------------
+def text_field(record, key, default=''):
+    """``record[key]`` as stripped text; JSON numbers such as a phone are accepted, lists and objects are not."""
+    value = record.get(key)
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValidationError(f"Field '{key}' must be text.")
+    return str(value).strip()
+
+
+def clean_row(record):
+    """Return the normalised employee fields, or raise ValidationError with the reason."""
+    if not isinstance(record, dict):
+        raise ValidationError("Record is not an object.")
+    name = text_field(record, 'name')
+    email = text_field(record, 'email').lower()
+    phone = text_field(record, 'phone')
+    role = text_field(record, 'role', 'employee').lower()
+    if not name:
+        raise ValidationError("Name is required.")
+    validate_email(email)
+    if len(phone) > 15:
+        raise ValidationError("Phone number is longer than 15 characters.")
+    if role not in ROLES:
+        raise ValidationError(f"Unknown role '{role}'.")
+    return {'name': name[:100], 'email': email, 'phone': phone, 'role': role}
+
+
+def validate_batch(numbered_records, seen_emails, result):
+    """Validate a batch, dropping rows that are invalid, repeated in the file or already registered."""
+    rows = []
+    for row_number, record in numbered_records:
+        try:
+            row = clean_row(record)
+        except ValidationError as e:
+            result.error(row_number, ' '.join(e.messages))
+            continue
+        if row['email'] in seen_emails:
+            result.error(row_number, f"Duplicate email {row['email']} in import file.")
+            continue
+        seen_emails.add(row['email'])
+        rows.append((row_number, row))
+
+    emails = [row['email'] for _, row in rows]
+    taken = set(User.objects.filter(username__in=emails).values_list('username', flat=True))
+    taken |= set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+    valid = []
+    for row_number, row in rows:
+        if row['email'] in taken:
+            result.error(row_number, f"An employee with email {row['email']} already exists.")
+        else:
+            valid.append((row_number, row))
+    return valid
+
+
+# ---------------- Password Hashing ----------------
+def _init_hashing_worker():
+    # Spawned workers start without Django configured; forked ones already are.
+    if not apps.ready:
+        django.setup()
+
+
+def hashing_pool(workers):
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_hashing_worker)
+
+
+def hash_passwords(passwords, pool):
+    if pool is None:
+        return [make_password(password) for password in passwords]
+    return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // 32)))
+
+
+# ---------------- Writing ----------------
+def insert_batch(rows, hashed, passwords, send_welcome):
+    """Insert users, profiles, employees and welcome mail for ``rows`` in one transaction."""
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(username=row['email'], email=row['email'], first_name=row['name'], password=password)
+            for (_, row), password in zip(rows, hashed)
+        ])
+        if any(user.pk is None for user in users):
+            # Backends that cannot return ids from a bulk insert.
+            ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list('username', 'id'))
+            for user in users:
+                user.pk = ids[user.username]
+
+        Profile.objects.bulk_create([
+            Profile(user=user, name=row['name'], phone=row['phone'], role=row['role'], email=row['email'])
+            for user, (_, row) in zip(users, rows)
+        ])
+        employees = Employee.objects.bulk_create([
+            Employee(user=user, name=row['name'], email=row['email'], phone=row['phone'], role=row['role'])
+            for user, (_, row) in zip(users, rows)
+        ])
+        if send_welcome:
+            OutboundEmail.objects.bulk_create([
+                OutboundEmail(
+                    subject=WELCOME_SUBJECT,
+                    body=welcome_message(row['name'], row['email'], password),
+                    recipients=row['email'],
+                )
+                for (_, row), password in zip(rows, passwords)
+            ])
+        # bulk_create bypasses the signals that keep TaskStats, org paths and the cached fragments current.
+        stats.adjust(employee_count=len(users))
+        hierarchy.place_roots([employee.pk for employee in employees])
+        fragments.bump(fragments.EMPLOYEES)
+
+
+def insert_row(row, hashed, password, send_welcome):
+    """Single-row fallback used when a batch insert hits a conflict."""
+    with transaction.atomic():
+        user = User.objects.create(
+            username=row['email'], email=row['email'], first_name=row['name'], password=hashed
+        )
+        Profile.objects.create(user=user, name=row['name'], phone=row['phone'], role=row['role'], email=row['email'])
+        Employee.objects.create(user=user, name=row['name'], email=row['email'], phone=row['phone'], role=row['role'])
+        if send_welcome:
+            outbox.queue_mail(WELCOME_SUBJECT, welcome_message(row['name'], row['email'], password), [row['email']])
+
+
+def import_employees(records, batch_size=IMPORT_BATCH_SIZE, workers=1, send_welcome=True):
+    """
+    Create a User, Profile and Employee for every record in ``records``.
+
+    Records are consumed lazily in batches: each batch is validated with two
+    lookups, its random passwords are hashed in a process pool, and it is
+    written with bulk_create in its own transaction. Invalid rows are reported
+    in the result (1-based row numbers) and never abort the rest of the import.
+    """
+    result = ImportResult()
+    seen_emails = set()
+    numbered = enumerate(records, start=1)
+    pool = hashing_pool(workers)
+    try:
+        while True:
+            batch = list(itertools.islice(numbered, batch_size))
+            if not batch:
+                break
+            rows = validate_batch(batch, seen_emails, result)
+            if not rows:
+                continue
+            passwords = [get_random_string(length=10) for _ in rows]
+            hashed = hash_passwords(passwords, pool)
+            try:
+                insert_batch(rows, hashed, passwords, send_welcome)
+                result.created += len(rows)
+            except IntegrityError:
+                # Someone registered one of these emails meanwhile; isolate the offending rows.
+                for (row_number, row), hash_, password in zip(rows, hashed, passwords):
+                    try:
+                        insert_row(row, hash_, password, send_welcome)
+                        result.created += 1
+                    except IntegrityError as e:
+                        result.error(row_number, f"Could not create {row['email']}: {e}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    result.errors.sort()
+    return result
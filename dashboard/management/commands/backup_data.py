@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import backups
+
+
+class Command(BaseCommand):
+    help = "Stream the auth and dashboard tables to a JSON Lines backup, model by model."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Output file; compressed with gzip when it ends in .gz.')
+        parser.add_argument('--gzip', action='store_true', help='Compress regardless of the file name.')
+        parser.add_argument('--chunk-size', type=int, default=backups.BACKUP_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        compress = True if options['gzip'] else None
+        try:
+            with backups.open_backup(options['path'], 'w', compress=compress) as fp:
+                counts = backups.write_backup(fp, chunk_size=options['chunk_size'])
+        except OSError as e:
+            raise CommandError(str(e))
+        for label, count in counts.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Backed up {sum(counts.values())} object(s) to {options["path"]}.'))
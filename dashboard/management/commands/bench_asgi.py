@@ -0,0 +1,116 @@
+import asyncio
+import statistics
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+
+PAGES = [
+    ('dashboard', 'async_dashboard'),
+    ('all_tasks', 'async_all_tasks'),
+    ('employee_list', 'async_employee_list'),
+]
+
+
+def summarize(timings, failures, elapsed):
+    if not timings:
+        return f'no successful requests, {failures} failed'
+    return (
+        f'{len(timings) / elapsed:7.1f} req/s, median {statistics.median(timings):6.2f} ms, '
+        f'{failures} failed'
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync views through the WSGI handler with the async views through the ASGI "
+        "handler, with concurrent in-process clients. Run against a copy of real data; for "
+        "end-to-end numbers put gunicorn / uvicorn under an HTTP load tool instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200, help='Requests per page and mode.')
+        parser.add_argument('--cold', action='store_true', help='Clear the cache before every request.')
+
+    def handle(self, *args, **options):
+        username = f'bench-{get_random_string(8)}'
+        self.user = User.objects.create_superuser(username, f'{username}@example.com', get_random_string(16))
+        try:
+            # The test clients send Host: testserver.
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                self.compare(options)
+        finally:
+            self.user.delete()
+
+    def compare(self, options):
+        for sync_name, async_name in PAGES:
+            self.stdout.write(f'{sync_name}:')
+            self.stdout.write(f'  WSGI / sync : {self.run_wsgi(reverse(sync_name), options)}')
+            self.stdout.write(f'  ASGI / async: {asyncio.run(self.run_asgi(reverse(async_name), options))}')
+
+    def run_wsgi(self, url, options):
+        timings = []
+        failures = []
+        lock = threading.Lock()
+        per_worker = options['requests'] // options['concurrency']
+
+        def worker():
+            client = Client()
+            client.force_login(self.user)
+            own, failed = [], 0
+            try:
+                for _ in range(per_worker):
+                    if options['cold']:
+                        cache.clear()
+                    start = time.perf_counter()
+                    if client.get(url).status_code == 200:
+                        own.append((time.perf_counter() - start) * 1000)
+                    else:
+                        failed += 1
+            finally:
+                connections.close_all()
+                with lock:
+                    timings.extend(own)
+                    failures.append(failed)
+
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return summarize(timings, sum(failures), time.perf_counter() - start)
+
+    async def run_asgi(self, url, options):
+        timings = []
+        failures = []
+        per_worker = options['requests'] // options['concurrency']
+
+        async def worker():
+            client = AsyncClient()
+            await client.aforce_login(self.user)
+            for _ in range(per_worker):
+                if options['cold']:
+                    await cache.aclear()
+                start = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code == 200:
+                    timings.append((time.perf_counter() - start) * 1000)
+                else:
+                    failures.append(url)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(options['concurrency'])])
+        elapsed = time.perf_counter() - start
+        await sync_to_async(connections.close_all)()
+        return summarize(timings, len(failures), elapsed)
@@ -0,0 +1,94 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from dashboard import stats
+from dashboard.models import Employee, Task
+
+
+class Rollback(Exception):
+    pass
+
+
+def per_filter_counters(today):
+    """The original dashboard implementation: one COUNT(*) per counter."""
+    counters = {
+        name: Task.objects.filter(condition).count()
+        for name, condition in stats.counter_filters(today).items()
+    }
+    counters['employee_count'] = Employee.objects.count()
+    return counters
+
+
+class Command(BaseCommand):
+    help = "Compare the dashboard counter strategies: one COUNT(*) per counter, one aggregate pass, summary table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help='Timed runs per strategy.')
+        parser.add_argument(
+            '--seed-tasks', type=int, default=0,
+            help='Insert this many synthetic tasks for the run; they are rolled back afterwards.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['seed_tasks']:
+                    self.seed(options['seed_tasks'])
+                self.run(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        today = timezone.now().date()
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        batch = []
+        for i in range(count):
+            offset = random.randint(-30, 30)
+            batch.append(Task(
+                title=f'Benchmark task {i}',
+                description='',
+                status=random.choice(statuses),
+                due_date=None if offset == 0 else today + timedelta(days=offset),
+            ))
+            if len(batch) == 1000:
+                Task.objects.bulk_create(batch)
+                batch = []
+        Task.objects.bulk_create(batch)
+        # bulk_create bypasses the signals that maintain the summary table.
+        stats.rebuild(today)
+        self.stdout.write(f'Seeded {count} tasks.')
+
+    def run(self, repeat):
+        today = timezone.now().date()
+        strategies = [
+            ('per-filter', lambda: per_filter_counters(today)),
+            ('aggregate', lambda: stats.compute_counters(today)),
+            ('summary', lambda: stats.read_counters(today)),
+        ]
+
+        results = {}
+        for label, func in strategies:
+            with CaptureQueriesContext(connection) as ctx:
+                results[label] = func()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f'{label:>12}: {len(ctx.captured_queries)} queries, '
+                f'median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms'
+            )
+
+        if any(result != results['per-filter'] for result in results.values()):
+            self.stderr.write(self.style.ERROR('Counter mismatch between strategies!'))
+        else:
+            self.stdout.write(self.style.SUCCESS('All strategies agree.'))
@@ -0,0 +1,92 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+
+from dashboard import stats
+from dashboard.db import is_lock_error
+from dashboard.models import Task
+from dashboard.pagination import paginate
+
+
+BENCH_PREFIX = '[bench] '
+
+
+def read_op():
+    stats.read_counters()
+    list(paginate(Task.objects.all(), None, per_page=50).object_list)
+
+
+def write_op(worker, i):
+    with transaction.atomic():
+        Task.objects.create(title=f'{BENCH_PREFIX}{worker}-{i}', description='Concurrency benchmark')
+
+
+class Command(BaseCommand):
+    help = "Measure read and write throughput with concurrent threads against the configured database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run.')
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark tasks instead of deleting them.')
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        self.stdout.write(
+            f'journal_mode={journal_mode}, transaction_mode={getattr(connection, "transaction_mode", None)}, '
+            f'{options["readers"]} reader(s), {options["writers"]} writer(s), {options["duration"]}s'
+        )
+
+        deadline = time.monotonic() + options['duration']
+        results = {'read': [], 'write': []}
+        errors = {'read': 0, 'write': 0}
+        lock = threading.Lock()
+
+        def worker(kind, number):
+            timings = []
+            failed = 0
+            i = 0
+            try:
+                while time.monotonic() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        read_op() if kind == 'read' else write_op(number, i)
+                    except OperationalError as e:
+                        if not is_lock_error(e):
+                            raise
+                        failed += 1
+                    else:
+                        timings.append((time.perf_counter() - start) * 1000)
+                    i += 1
+            finally:
+                connections.close_all()
+                with lock:
+                    results[kind].extend(timings)
+                    errors[kind] += failed
+
+        threads = [threading.Thread(target=worker, args=('read', n)) for n in range(options['readers'])]
+        threads += [threading.Thread(target=worker, args=('write', n)) for n in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for kind in ('read', 'write'):
+            timings = sorted(results[kind])
+            if not timings:
+                self.stdout.write(f'{kind:>6}: no operations completed, {errors[kind]} locked')
+                continue
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f'{kind:>6}: {len(timings) / options["duration"]:.1f} ops/s, '
+                f'median {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms, {errors[kind]} locked'
+            )
+
+        if not options['keep']:
+            deleted, _ = Task.objects.filter(title__startswith=BENCH_PREFIX).delete()
+            self.stdout.write(f'Removed {deleted} benchmark row(s).')
@@ -0,0 +1,214 @@
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from dashboard import urls
+from dashboard.models import Employee, Notification, Task
+
+
+# Routes that change data or end the session on GET, and POST-only endpoints.
+SKIPPED = {
+    'logout', 'employee_logout', 'delete_employee', 'delete_user',
+    'bulk_update_tasks', 'mark_notifications_read',
+}
+QUERY_STRINGS = {
+    'search_tasks': 'q=report',
+    'employee_autocomplete': 'q=a',
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, cwd=settings.BASE_DIR
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def url_arguments():
+    """Sample objects for the URL patterns that take a primary key or a file name."""
+    thumbnail = Employee.objects.exclude(profile_thumbnail='').values_list('profile_thumbnail', flat=True).first()
+    return {
+        'edit_task': {'pk': Task.objects.values_list('pk', flat=True).first()},
+        'delete_task': {'pk': Task.objects.values_list('pk', flat=True).first()},
+        'edit_employee': {'pk': Employee.objects.values_list('pk', flat=True).first()},
+        'edit_user': {'user_id': User.objects.values_list('pk', flat=True).first()},
+        'thumbnail': {'name': thumbnail},
+    }
+
+
+def bench_targets(only=None):
+    """``(name, url)`` for every named GET-able route in dashboard/urls.py, once per name."""
+    arguments = url_arguments()
+    seen = set()
+    for pattern in urls.urlpatterns:
+        name = pattern.name
+        if not name or name in seen or name in SKIPPED or (only and name not in only):
+            continue
+        seen.add(name)
+        kwargs = {}
+        if pattern.pattern.converters:
+            kwargs = arguments.get(name, {})
+            if None in kwargs.values() or set(kwargs) != set(pattern.pattern.converters):
+                continue
+        url = reverse(name, kwargs=kwargs)
+        if name in QUERY_STRINGS:
+            url = f'{url}?{QUERY_STRINGS[name]}'
+        yield name, url
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every page in dashboard/urls.py through the test client as a superuser and report "
+        "p50 / p95 latency, query counts and peak Python memory as JSON, optionally compared with an "
+        "earlier run. Seed data with generate_demo_data first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per URL.')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per URL first.')
+        parser.add_argument('--cold', action='store_true', help='Clear the cache before every request.')
+        parser.add_argument('--only', nargs='+', metavar='NAME', help='Benchmark just these URL names.')
+        parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+        parser.add_argument('--compare', help='An earlier JSON report to print the differences against.')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        baseline = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as fp:
+                baseline = json.load(fp)
+
+        username = f'bench-{get_random_string(8)}'
+        user = User.objects.create_superuser(username, f'{username}@example.com', get_random_string(16))
+        try:
+            # The test client sends Host: testserver.
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                report = self.run(user, options)
+        finally:
+            user.delete()
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fp:
+                fp.write(output + '\n')
+        elif not baseline:
+            self.stdout.write(output)
+        if baseline:
+            self.print_comparison(baseline, report)
+
+    def run(self, user, options):
+        client = Client()
+        client.force_login(user)
+        # Employee pages read the employee from the session; use the busiest one.
+        busiest = Employee.objects.annotate(n=Count('tasks')).order_by('-n').values_list('pk', flat=True).first()
+        if busiest is not None:
+            session = client.session
+            session['employee_id'] = busiest
+            session.save()
+
+        results = {}
+        for name, url in bench_targets(options['only']):
+            results[name] = self.measure(client, url, options)
+            self.stderr.write(f"{name:<28} {results[name]['p50_ms']:8.2f} ms  {results[name]['queries']:4} queries")
+        return {
+            'revision': git_revision(),
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'rows': {
+                'users': User.objects.count(),
+                'employees': Employee.objects.count(),
+                'tasks': Task.objects.count(),
+                'notifications': Notification.objects.count(),
+            },
+            'options': {'repeat': options['repeat'], 'cold': options['cold']},
+            'results': results,
+        }
+
+    def request(self, client, url, cold):
+        if cold:
+            cache.clear()
+        response = client.get(url)
+        if response.streaming:
+            # CSV exports and thumbnails do their work while the body is read.
+            b''.join(response.streaming_content)
+        return response
+
+    def measure(self, client, url, options):
+        for _ in range(options['warmup']):
+            self.request(client, url, options['cold'])
+
+        timings = []
+        queries = []
+        for _ in range(options['repeat']):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = self.request(client, url, options['cold'])
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+
+        # A separate pass: tracing allocations would distort the timings above.
+        tracemalloc.start()
+        try:
+            self.request(client, url, options['cold'])
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'url': url,
+            'status': response.status_code,
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': max(queries),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def print_comparison(self, baseline, report):
+        self.stdout.write(
+            f"Comparing {baseline.get('revision') or 'baseline'} -> {report.get('revision') or 'current'}"
+        )
+        self.stdout.write(f"{'url name':<28} {'p50 ms':>18} {'p95 ms':>18} {'queries':>10} {'peak KB':>18}")
+        for name, now in report['results'].items():
+            before = baseline.get('results', {}).get(name)
+            if before is None:
+                self.stdout.write(f'{name:<28} (new)')
+                continue
+            self.stdout.write(
+                f"{name:<28} {self.delta(before['p50_ms'], now['p50_ms']):>18} "
+                f"{self.delta(before['p95_ms'], now['p95_ms']):>18} "
+                f"{before['queries']:>4} → {now['queries']:<3} "
+                f"{self.delta(before['peak_memory_kb'], now['peak_memory_kb']):>18}"
+            )
+
+    def delta(self, before, now):
+        change = f'{(now - before) / before * 100:+.0f}%' if before else 'n/a'
+        return f'{now:.1f} ({change})'
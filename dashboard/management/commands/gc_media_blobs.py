@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from dashboard import media
+
+
+class Command(BaseCommand):
+    help = "Recount profile picture blob references and delete blobs that nothing points at."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would change.')
+
+    def handle(self, *args, **options):
+        fixed, orphans = media.collect_garbage(dry_run=options['dry_run'])
+        for name in fixed:
+            self.stdout.write(f'Reference count corrected: {name}')
+        for name in orphans:
+            self.stdout.write(f'Unreferenced blob: {name}')
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(fixed)} reference count(s) corrected. {verb} {len(orphans)} unreferenced blob(s).'
+        ))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import demo
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, employees, tasks, assignments and notifications for "
+        "benchmarking. Never run this against production data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Users, each with a Profile and an Employee.')
+        parser.add_argument('--tasks', type=int, default=1000)
+        parser.add_argument('--max-assignees', type=int, default=3, help='Employees assigned per task, at most.')
+        parser.add_argument('--notifications-per-user', type=int, default=5)
+        parser.add_argument('--seed', type=int, help='Seed for a reproducible data shape.')
+        parser.add_argument('--prefix', default='demo', help='Username prefix of the generated users.')
+        parser.add_argument('--batch-size', type=int, default=demo.DEMO_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['tasks'] < 0 or options['batch_size'] < 1:
+            raise CommandError("--users and --batch-size must be positive and --tasks not negative.")
+        start = time.perf_counter()
+        result = demo.generate(
+            users=options['users'],
+            tasks=options['tasks'],
+            max_assignees=options['max_assignees'],
+            notifications_per_user=options['notifications_per_user'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {result.users} user(s), {result.tasks} task(s), {result.assignments} assignment(s) and '
+            f'{result.notifications} notification(s) in {time.perf_counter() - start:.1f}s. '
+            f'Demo users log in with the password "{demo.DEMO_PASSWORD}".'
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from dashboard import thumbnails
+from dashboard.models import Employee, Profile
+
+
+class Command(BaseCommand):
+    help = "Render missing profile picture thumbnails (e.g. for uploads made before thumbnails existed)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-render every thumbnail, not only missing ones.')
+
+    def handle(self, *args, **options):
+        rendered = 0
+        for model in (Employee, Profile):
+            pictures = model.objects.exclude(profile_picture__isnull=True).exclude(profile_picture='')
+            if not options['all']:
+                pictures = pictures.filter(profile_thumbnail='')
+            for pk in pictures.values_list('pk', flat=True).iterator():
+                if thumbnails.update_thumbnail(model._meta.label, pk):
+                    rendered += 1
+        self.stdout.write(self.style.SUCCESS(f'Rendered {rendered} thumbnail(s).'))
@@ -0,0 +1,39 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import importers
+from dashboard.streams import text_stream
+
+
+class Command(BaseCommand):
+    help = "Bulk-create users, profiles and employees from a CSV or JSON / JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File with name, email, phone and role columns/keys.')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=importers.IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processes used to hash the generated passwords.'
+        )
+        parser.add_argument('--no-welcome-email', action='store_true', help='Do not queue welcome emails.')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or importers.guess_format(options['path'])
+        try:
+            with open(options['path'], 'rb') as binary:
+                result = importers.import_employees(
+                    importers.read_records(text_stream(binary), fmt),
+                    batch_size=options['batch_size'],
+                    workers=options['workers'],
+                    send_welcome=not options['no_welcome_email'],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for row_number, message in result.errors:
+            self.stderr.write(f'Row {row_number}: {message}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {result.created} employee(s); {len(result.errors)} row(s) rejected.'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from dashboard import hierarchy
+
+
+class Command(BaseCommand):
+    help = "Recompute every employee's materialized org path from Employee.manager."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fixed = hierarchy.rebuild(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Org paths rebuilt; {fixed} employee(s) corrected.'))
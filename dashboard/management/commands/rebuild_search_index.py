@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the task full-text search index in streaming batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not search.fts_enabled():
+            raise CommandError("The full-text index is only maintained on SQLite.")
+        indexed = search.rebuild_index(
+            options['batch_size'], progress=lambda count: self.stdout.write(f'Indexed {count} task(s)…')
+        )
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt for {indexed} task(s).'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the TaskStats summary from the Task and Employee tables, or check it for drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report counters that disagree with the tables; exit non-zero on drift.'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drift = stats.find_drift()
+            for name, (stored, actual) in sorted(drift.items()):
+                self.stdout.write(f'{name}: stored {stored}, actual {actual}')
+            if drift:
+                raise CommandError(f'{len(drift)} task stats counter(s) have drifted.')
+            self.stdout.write(self.style.SUCCESS('Task stats are consistent.'))
+            return
+
+        row = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt task stats as of {row.as_of}: {row.task_count} tasks, {row.employee_count} employees.'
+        ))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from dashboard import backups
+from dashboard.streams import iter_json_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Restore a backup_data JSON Lines file (plain or gzip) or a dumpdata JSON array "
+        "such as backup.json, streaming it in bulk_create batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=backups.RESTORE_BATCH_SIZE)
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Skip rows whose primary key already exists instead of failing.'
+        )
+        parser.add_argument(
+            '--allow-truncated', action='store_true',
+            help='Restore the records before the point where a truncated file stops.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with backups.open_backup(options['path']) as fp:
+                result = backups.restore_records(
+                    iter_json_records(fp),
+                    batch_size=options['batch_size'],
+                    ignore_conflicts=options['ignore_conflicts'],
+                    allow_truncated=options['allow_truncated'],
+                )
+        except ValueError as e:
+            raise CommandError(f'{e} Nothing was restored; use --allow-truncated to keep the readable part.')
+        except (OSError, IntegrityError) as e:
+            raise CommandError(str(e))
+
+        for label, count in result.counts.items():
+            self.stdout.write(f'{label}: {count}')
+        if result.truncated:
+            self.stderr.write(self.style.WARNING('The file is truncated; only the complete records were restored.'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Restored {sum(result.counts.values())} object(s); skipped {result.skipped} derived or built-in record(s).'
+        ))
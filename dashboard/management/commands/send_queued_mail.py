@@ -0,0 +1,44 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from dashboard import outbox
+
+
+def drain(batch_size):
+    """Deliver batches until the queue has nothing due; runs in a worker thread."""
+    sent = failed = 0
+    try:
+        while True:
+            batch_sent, batch_failed = outbox.deliver_batch(batch_size)
+            if not batch_sent and not batch_failed:
+                return sent, failed
+            sent += batch_sent
+            failed += batch_failed
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbound email in batches, one mail connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=2, help='Parallel delivery threads.')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when idle.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop.')
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                futures = [pool.submit(drain, options['batch_size']) for _ in range(options['workers'])]
+                results = [future.result() for future in futures]
+                sent = sum(result[0] for result in results)
+                failed = sum(result[1] for result in results)
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent} message(s), {failed} failed.')
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
@@ -0,0 +1,101 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Employee, MediaBlob, Profile
+from .storage import is_blob, profile_picture_storage
+
+
+# ---------------- Reference Counting ----------------
+def retain(name):
+    """Count one more model field pointing at blob ``name``."""
+    if not is_blob(name):
+        return
+    if MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            MediaBlob.objects.create(name=name, ref_count=1)
+    except IntegrityError:
+        MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+
+
+def release(name):
+    """Drop one reference to blob ``name``; the file is deleted with its last reference."""
+    if not is_blob(name):
+        return
+    MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') - 1)
+    if MediaBlob.objects.filter(name=name, ref_count__lte=0).delete()[0]:
+        transaction.on_commit(lambda: _delete_if_unreferenced(name))
+
+
+def _delete_if_unreferenced(name):
+    # Someone may have uploaded the same content again since the release. The
+    # DELETE takes the write lock first, so the check and the file removal cannot
+    # interleave with DedupStorage._save taking a new reference.
+    with transaction.atomic():
+        MediaBlob.objects.filter(name=name, ref_count__lte=0).delete()
+        if not MediaBlob.objects.filter(name=name).exists():
+            profile_picture_storage.delete(name)
+
+
+# ---------------- Reconciliation ----------------
+def referenced_blobs():
+    """Count the Employee and Profile pictures pointing at each blob."""
+    counts = {}
+    for model in (Employee, Profile):
+        for name in model.objects.exclude(profile_picture='').values_list('profile_picture', flat=True).iterator():
+            if is_blob(name):
+                counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def stored_blobs(directory='profile_pics'):
+    storage = profile_picture_storage
+    if not storage.exists(directory):
+        return set()
+    names = set()
+    for prefix in storage.listdir(directory)[0]:
+        for filename in storage.listdir(f'{directory}/{prefix}')[1]:
+            name = f'{directory}/{prefix}/{filename}'
+            if is_blob(name):
+                names.add(name)
+    return names
+
+
+def find_drift():
+    """Return ``(wrong_names, actual_counts)`` comparing MediaBlob rows with the tables."""
+    actual = referenced_blobs()
+    stored = dict(MediaBlob.objects.values_list('name', 'ref_count'))
+    wrong = sorted(name for name in actual.keys() | stored.keys() if actual.get(name, 0) != stored.get(name, 0))
+    return wrong, actual
+
+
+def recount():
+    """Reset every MediaBlob count from the tables; returns the names that were wrong."""
+    wrong, actual = find_drift()
+    _store_counts(wrong, actual)
+    return wrong
+
+
+def _store_counts(wrong, actual):
+    with transaction.atomic():
+        MediaBlob.objects.exclude(name__in=actual).delete()
+        for name in wrong:
+            if name in actual:
+                MediaBlob.objects.update_or_create(name=name, defaults={'ref_count': actual[name]})
+
+
+def collect_garbage(dry_run=False):
+    """
+    Recount blob references from the tables and delete blobs nothing points at.
+
+    Returns ``(fixed_counts, deleted_files)``. Covers references changed through
+    update()/bulk paths that bypass the signals.
+    """
+    wrong, actual = find_drift()
+    orphans = sorted(stored_blobs() - actual.keys())
+    if not dry_run:
+        _store_counts(wrong, actual)
+        for name in orphans:
+            profile_picture_storage.delete(name)
+    return wrong, orphans
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_alter_notification_timestamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDueDateBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('due_date', models.DateField(unique=True)),
+                ('task_count', models.IntegerField(default=0)),
+                ('open_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_count', models.IntegerField(default=0)),
+                ('employee_count', models.IntegerField(default=0)),
+                ('pending_count', models.IntegerField(default=0)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('no_deadline_count', models.IntegerField(default=0)),
+                ('assignment_count', models.IntegerField(default=0)),
+                ('overdue_count', models.IntegerField(default=0)),
+                ('as_of', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'task stats',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_task_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-created_at', 'id'], name='task_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', '-created_at', 'id'], name='task_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['due_date', 'status'], name='task_due_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'in_progress'])), fields=['due_date'], name='task_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_by', '-created_at'], name='task_assigner_created_idx'),
+        ),
+    ]
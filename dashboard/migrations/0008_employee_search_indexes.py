@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:56
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_notification_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='employee_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='employee_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+FTS_TABLE = 'dashboard_task_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    # The full-text index is an SQLite FTS5 table; other backends fall back to icontains.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        f"USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE}(rowid, title, description) "
+        f"SELECT id, title, description FROM dashboard_task"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_employee_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
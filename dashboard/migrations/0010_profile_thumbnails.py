@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_task_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='profile_thumbnail',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='profile_thumbnail',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:03
+
+import dashboard.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_profile_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('ref_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=dashboard.storage.DedupStorage(), upload_to='profile_pics/'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='profile_picture',
+            field=models.ImageField(default='default.jpg', storage=dashboard.storage.DedupStorage(), upload_to='profile_pics/'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+from dashboard.hierarchy import compute_paths
+
+
+def build_org_paths(apps, schema_editor):
+    Employee = apps.get_model('dashboard', 'Employee')
+    paths = compute_paths(Employee.objects.values_list('pk', 'user_id', 'manager_id'))
+    Employee.objects.bulk_update(
+        [Employee(pk=pk, org_path=path) for pk, path in paths.items()], ['org_path'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0011_media_blobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='org_path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['org_path'], name='employee_org_path_idx'),
+        ),
+        migrations.RunPython(build_org_paths, migrations.RunPython.noop),
+    ]
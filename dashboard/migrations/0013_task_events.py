@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:26
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0012_employee_org_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.PositiveSmallIntegerField(blank=True, choices=[(1, 'Pending'), (2, 'In Progress'), (3, 'Completed')], null=True)),
+                ('to_status', models.PositiveSmallIntegerField(choices=[(1, 'Pending'), (2, 'In Progress'), (3, 'Completed')])),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('duration', models.PositiveIntegerField(blank=True, help_text='Seconds spent in from_status.', null=True)),
+                ('age', models.PositiveIntegerField(default=0, help_text='Seconds since the task was created.')),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='dashboard.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'timestamp'], name='taskevent_task_time_idx'), models.Index(fields=['to_status', 'timestamp'], name='taskevent_to_time_idx'), models.Index(fields=['from_status', 'timestamp'], name='taskevent_from_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:49
+
+import dashboard.models
+from django.conf import settings
+from django.db import migrations, models
+
+from dashboard.models import fold
+
+
+def fill_search_keys(apps, schema_editor):
+    Employee = apps.get_model('dashboard', 'Employee')
+    Employee.objects.bulk_update([
+        Employee(pk=pk, search_name=fold(name)[:100], search_email=fold(email)[:255])
+        for pk, name, email in Employee.objects.values_list('pk', 'name', 'email').iterator()
+    ], ['search_name', 'search_email'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0013_task_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employee_name_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employee_email_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='search_email',
+            field=dashboard.models.FoldedCopyField(blank=True, default='', editable=False, max_length=255, source='email'),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='search_name',
+            field=dashboard.models.FoldedCopyField(blank=True, default='', editable=False, max_length=100, source='name'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['search_name', 'id'], name='employee_search_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['search_email'], name='employee_search_email_idx'),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
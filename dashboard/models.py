@@ -1,7 +1,12 @@
+from datetime import timedelta
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.urls import reverse
 from django.utils import timezone
 
+from .storage import profile_picture_storage
+
 # Define role choices for user profiles
 ROLE_CHOICES = (
     ('admin', 'Admin'),
@@ -9,13 +14,49 @@ ROLE_CHOICES = (
     ('employee', 'Employee'),
 )
 
+
+def avatar_url(instance):
+    """Small cached thumbnail when one has been rendered, else the original upload."""
+    if instance.profile_thumbnail:
+        return reverse('thumbnail', args=[instance.profile_thumbnail])
+    return instance.profile_picture.url if instance.profile_picture else ''
+
+
+def fold(value):
+    """Case-fold ``value`` for prefix search; done in Python because SQLite's lower() only folds ASCII."""
+    return (value or '').casefold()
+
+
+class FoldedCopyField(models.CharField):
+    """Read-only case-folded copy of another field, refreshed on save() and bulk_create()."""
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('default', '')
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = fold(getattr(model_instance, self.source))[:self.max_length]
+        setattr(model_instance, self.attname, value)
+        return value
+
+
 class Employee(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     name = models.CharField(max_length=100, null=True, blank=True)
     email = models.EmailField(max_length=255, null=True, blank=True)
     phone = models.CharField(max_length=15, null=True, blank=True)
     role = models.CharField(max_length=100, null=True, blank=True)
-    profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    profile_picture = models.ImageField(upload_to='profile_pics/', storage=profile_picture_storage, blank=True, null=True)
+    # Name under media/thumbs/ of the avatar rendered from profile_picture (dashboard.thumbnails).
+    profile_thumbnail = models.CharField(max_length=100, blank=True, default='', editable=False)
     manager = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -23,10 +64,29 @@ class Employee(models.Model):
         blank=True,
         related_name='employees'
     )
+    # Ids from the top of the reporting chain down to this employee, e.g. '/3/17/42/'
+    # (dashboard.hierarchy); maintained on save, repaired by `manage.py rebuild_org_paths`.
+    org_path = models.CharField(max_length=255, blank=True, default='', editable=False)
+    # Case-folded name and email for the employee autocomplete's prefix search (dashboard.search).
+    search_name = FoldedCopyField(max_length=100, source='name')
+    search_email = FoldedCopyField(max_length=255, source='email')
+
+    class Meta:
+        indexes = [
+            # Case-insensitive prefix search for the employee autocomplete.
+            models.Index(fields=['search_name', 'id'], name='employee_search_name_idx'),
+            models.Index(fields=['search_email'], name='employee_search_email_idx'),
+            # Org subtrees are org_path range scans.
+            models.Index(fields=['org_path'], name='employee_org_path_idx'),
+        ]
 
     def __str__(self):
         return self.name or "Unnamed Employee"
 
+    @property
+    def avatar_url(self):
+        return avatar_url(self)
+
 class Task(models.Model):
     STATUS_PENDING = 'pending'
     STATUS_IN_PROGRESS = 'in_progress'
@@ -53,16 +113,195 @@ class Task(models.Model):
     alert_all = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # All Tasks keyset pages, unfiltered and by status.
+            models.Index(fields=['-created_at', 'id'], name='task_created_id_idx'),
+            models.Index(fields=['status', '-created_at', 'id'], name='task_status_created_idx'),
+            # Due-date ranges and the dashboard counters (covers status for the aggregate).
+            models.Index(fields=['due_date', 'status'], name='task_due_status_idx'),
+            # Open (pending / in progress) tasks by due date, e.g. overdue lists. SQLite
+            # only matches partial indexes against literal predicates, so there the
+            # status/due_date indexes above serve these queries instead.
+            models.Index(
+                fields=['due_date'],
+                condition=models.Q(status__in=['pending', 'in_progress']),
+                name='task_open_due_idx',
+            ),
+            # Tasks a manager has handed out, newest first.
+            models.Index(fields=['assigned_by', '-created_at'], name='task_assigner_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+class Notification(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True)
+    message = models.TextField()
+    is_read = models.BooleanField(default=False)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Unread badge counts and "mark all read".
+            models.Index(fields=['user', 'is_read'], name='notification_unread_idx'),
+            # A user's notification list, newest first.
+            models.Index(fields=['user', '-timestamp'], name='notification_user_time_idx'),
+        ]
+
+    def __str__(self):
+        return self.message
+
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=100, null=True, blank=True)
     phone = models.CharField(max_length=15)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
-    profile_picture = models.ImageField(upload_to='profile_pics/', default='default.jpg')
+    profile_picture = models.ImageField(upload_to='profile_pics/', storage=profile_picture_storage, default='default.jpg')
+    profile_thumbnail = models.CharField(max_length=100, blank=True, default='', editable=False)
     email = models.EmailField()
 
     def __str__(self):
         return self.name or self.user.username
+
+    @property
+    def avatar_url(self):
+        return avatar_url(self)
+
+
+class TaskStats(models.Model):
+    """
+    Single-row summary of the admin dashboard counters.
+
+    Kept current by the signal handlers in dashboard.signals; rebuild it with
+    ``manage.py rebuild_task_stats`` if it ever drifts. ``overdue_count`` is only
+    valid for the ``as_of`` date and is rolled forward on read using
+    TaskDueDateBucket, so no full rescan is needed at midnight.
+    """
+    task_count = models.IntegerField(default=0)
+    employee_count = models.IntegerField(default=0)
+    pending_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    no_deadline_count = models.IntegerField(default=0)
+    assignment_count = models.IntegerField(default=0)
+    overdue_count = models.IntegerField(default=0)
+    as_of = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'task stats'
+
+    def __str__(self):
+        return f"Task stats as of {self.as_of}"
+
+
+class TaskDueDateBucket(models.Model):
+    """Number of tasks (and of open tasks) due on each date."""
+    due_date = models.DateField(unique=True)
+    task_count = models.IntegerField(default=0)
+    open_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.due_date}: {self.task_count}"
+
+
+class OutboundEmail(models.Model):
+    """Durable outbox row; delivered by ``manage.py send_queued_mail`` (see dashboard.outbox)."""
+    STATUS_QUEUED = 'queued'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.TextField(help_text='Comma-separated addresses.')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+            models.Index(fields=['claim_token'], name='outbox_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipients}"
+
+
+class MediaBlob(models.Model):
+    """Reference count for a content-addressed upload shared by Profile/Employee pictures (dashboard.media)."""
+    name = models.CharField(max_length=255, unique=True)
+    ref_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
+class TaskEvent(models.Model):
+    """
+    One task status transition; the log is append-only (dashboard.activity).
+
+    Statuses are stored as small integer codes, and each row carries the
+    seconds the task spent in ``from_status`` and its age, so time-in-status
+    and cycle-time reports are plain aggregates with no self-joins.
+    """
+    PENDING = 1
+    IN_PROGRESS = 2
+    COMPLETED = 3
+    STATUS_CODES = {
+        Task.STATUS_PENDING: PENDING,
+        Task.STATUS_IN_PROGRESS: IN_PROGRESS,
+        Task.STATUS_COMPLETED: COMPLETED,
+    }
+    STATUS_CHOICES = [(PENDING, 'Pending'), (IN_PROGRESS, 'In Progress'), (COMPLETED, 'Completed')]
+
+    # The (task, timestamp) index covers lookups by task, so the FK needs none of its own.
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='events', db_index=False)
+    # History is never rewritten: deleting a user leaves its id behind instead of
+    # an unindexed UPDATE over the whole log.
+    actor = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+        null=True, blank=True, related_name='+',
+    )
+    from_status = models.PositiveSmallIntegerField(choices=STATUS_CHOICES, null=True, blank=True)
+    to_status = models.PositiveSmallIntegerField(choices=STATUS_CHOICES)
+    timestamp = models.DateTimeField(default=timezone.now)
+    duration = models.PositiveIntegerField(null=True, blank=True, help_text='Seconds spent in from_status.')
+    age = models.PositiveIntegerField(default=0, help_text='Seconds since the task was created.')
+
+    class Meta:
+        indexes = [
+            # A task's history, and its latest event.
+            models.Index(fields=['task', 'timestamp'], name='taskevent_task_time_idx'),
+            # Throughput and time-in-status reports over a date range.
+            models.Index(fields=['to_status', 'timestamp'], name='taskevent_to_time_idx'),
+            models.Index(fields=['from_status', 'timestamp'], name='taskevent_from_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task {self.task_id}: {self.get_from_status_display()} -> {self.get_to_status_display()}"
+
+    @property
+    def time_in_previous_status(self):
+        return timedelta(seconds=self.duration) if self.duration is not None else None
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Task events are append-only.")
+        super().save(*args, **kwargs)
@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from . import background
+from .models import Employee, Notification, Task
+
+
+FAN_OUT_CHUNK_SIZE = 500
+UNREAD_CACHE_KEY = 'notifications:unread:{}'
+UNREAD_CACHE_TIMEOUT = 60 * 60
+
+
+# ---------------- Task Alert Fan-out ----------------
+def alert_message(task, created, actor_name):
+    verb = 'created' if created else 'updated'
+    return f"A task '{task.title}' has been {verb} by {actor_name}."
+
+
+def schedule_task_alert(task, created, actor):
+    """Queue a notification for every assigned employee once the task is committed."""
+    actor_name = actor.get_full_name() or actor.get_username()
+    background.submit_on_commit(fan_out_task_alert, task.pk, created, actor_name)
+
+
+def fan_out_task_alert(task_id, created, actor_name, chunk_size=FAN_OUT_CHUNK_SIZE):
+    """
+    Create one Notification per user behind the task's assigned employees.
+
+    Recipients are streamed from the database and inserted with bulk_create,
+    one transaction per chunk, so a task assigned to thousands of employees
+    costs a handful of multi-row INSERTs. Employees without a login are skipped.
+    Returns the number of notifications created.
+    """
+    task = Task.objects.filter(pk=task_id).only('id', 'title').first()
+    if task is None:
+        return 0
+    message = alert_message(task, created, actor_name)
+    user_ids = Employee.objects.filter(
+        tasks=task_id, user__isnull=False
+    ).order_by('user_id').values_list('user_id', flat=True).distinct()
+
+    created_count = 0
+    batch = []
+    for user_id in user_ids.iterator(chunk_size=chunk_size):
+        batch.append(Notification(user_id=user_id, task_id=task_id, message=message))
+        if len(batch) >= chunk_size:
+            created_count += _insert(batch)
+            batch = []
+    if batch:
+        created_count += _insert(batch)
+    return created_count
+
+
+def _insert(batch):
+    with transaction.atomic():
+        Notification.objects.bulk_create(batch)
+    # bulk_create sends no signals, so drop the recipients' cached counters here.
+    user_ids = {notification.user_id for notification in batch}
+    transaction.on_commit(lambda: invalidate_unread(user_ids))
+    return len(batch)
+
+
+# ---------------- Unread Counters ----------------
+def unread_count(user_id):
+    """Cached number of unread notifications; recounted only after an insert or read change."""
+    key = UNREAD_CACHE_KEY.format(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.set(key, count, UNREAD_CACHE_TIMEOUT)
+    return count
+
+
+def invalidate_unread(user_ids):
+    cache.delete_many([UNREAD_CACHE_KEY.format(user_id) for user_id in user_ids])
+
+
+def mark_all_read(user_id):
+    """Mark every unread notification for the user as read with a single UPDATE."""
+    marked = Notification.objects.filter(user_id=user_id, is_read=False).update(is_read=True)
+    transaction.on_commit(lambda: invalidate_unread([user_id]))
+    return marked
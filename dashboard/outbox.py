@@ -0,0 +1,116 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+MAX_ATTEMPTS = 5
+BACKOFF_SECONDS = 60
+MAX_BACKOFF_SECONDS = 60 * 60
+# A claim older than this is assumed to belong to a worker that died mid-batch.
+STALE_CLAIM = timedelta(minutes=15)
+
+
+# ---------------- Queueing ----------------
+def queue_mail(subject, message, recipient_list, from_email=None):
+    """Drop-in replacement for ``send_mail`` that stores the message for the background worker."""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or '',
+        recipients=','.join(recipient_list),
+    )
+
+
+def to_message(email, connection=None):
+    return EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=[address for address in email.recipients.split(',') if address],
+        connection=connection,
+    )
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS))
+
+
+# ---------------- Delivery ----------------
+def claim_batch(limit):
+    """
+    Atomically take up to ``limit`` due messages for this worker.
+
+    Rows are claimed with a conditional UPDATE tagged with a fresh token, so
+    concurrent workers never pick up the same message.
+    """
+    now = timezone.now()
+    OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_SENDING, claimed_at__lt=now - STALE_CLAIM
+    ).update(status=OutboundEmail.STATUS_QUEUED, claim_token='')
+
+    due = OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_QUEUED, next_attempt_at__lte=now
+    ).order_by('next_attempt_at').values_list('id', flat=True)[:limit]
+    token = uuid.uuid4().hex
+    OutboundEmail.objects.filter(pk__in=list(due), status=OutboundEmail.STATUS_QUEUED).update(
+        status=OutboundEmail.STATUS_SENDING, claim_token=token, claimed_at=now
+    )
+    return list(OutboundEmail.objects.filter(claim_token=token, status=OutboundEmail.STATUS_SENDING))
+
+
+def deliver_batch(batch_size=100):
+    """Send one claimed batch over a single backend connection; returns ``(sent, failed)``."""
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            record_failure(email, e)
+        return 0, len(emails)
+
+    sent_ids, failed = [], 0
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([to_message(email, connection)])
+            except Exception as e:
+                failed += 1
+                record_failure(email, e)
+            else:
+                sent_ids.append(email.pk)
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+        # Bodies can carry credentials (welcome mail), so they are not kept once delivered.
+        OutboundEmail.objects.filter(pk__in=sent_ids).update(
+            status=OutboundEmail.STATUS_SENT, sent_at=timezone.now(), claim_token='', last_error='', body=''
+        )
+        # Anything still claimed (the worker was interrupted) goes straight back on the queue.
+        OutboundEmail.objects.filter(
+            claim_token=emails[0].claim_token, status=OutboundEmail.STATUS_SENDING
+        ).exclude(pk__in=sent_ids).update(status=OutboundEmail.STATUS_QUEUED, claim_token='')
+    return len(sent_ids), failed
+
+
+def record_failure(email, error):
+    attempts = email.attempts + 1
+    gave_up = attempts >= MAX_ATTEMPTS
+    OutboundEmail.objects.filter(pk=email.pk).update(
+        status=OutboundEmail.STATUS_FAILED if gave_up else OutboundEmail.STATUS_QUEUED,
+        attempts=attempts,
+        next_attempt_at=timezone.now() + backoff(attempts),
+        claim_token='',
+        last_error=repr(error),
+        **({'body': ''} if gave_up else {}),
+    )
@@ -0,0 +1,98 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+
+
+# ---------------- Keyset Pagination ----------------
+# Pages are ordered by (-created_at, id) and addressed by a cursor holding the
+# boundary row's (created_at, id), so every page is one indexed range scan no
+# matter how deep the user goes, unlike OFFSET which re-reads all earlier rows.
+
+ORDERING = ('-created_at', 'id')
+REVERSED_ORDERING = ('created_at', '-id')
+
+
+def encode_cursor(direction, obj):
+    raw = f"{direction}|{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(direction, created_at, pk)``, or ``None`` for a missing or malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        direction, created_at, pk = raw.split('|')
+        if direction not in ('after', 'before'):
+            return None
+        return direction, datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def keyset_queryset(queryset, cursor=None):
+    """Apply the cursor boundary and ordering; ``before`` cursors walk the index backwards."""
+    position = decode_cursor(cursor)
+    if position is None:
+        return 'after', queryset.order_by(*ORDERING)
+    direction, created_at, pk = position
+    # The OR alone is not an index range for SQLite, which would then walk the
+    # index from the newest row; the redundant bound makes it a range search.
+    if direction == 'after':
+        boundary = Q(created_at__lt=created_at) | Q(created_at=created_at, id__gt=pk)
+        return direction, queryset.filter(boundary, created_at__lte=created_at).order_by(*ORDERING)
+    boundary = Q(created_at__gt=created_at) | Q(created_at=created_at, id__lt=pk)
+    return direction, queryset.filter(boundary, created_at__gte=created_at).order_by(*REVERSED_ORDERING)
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def paginate(queryset, cursor=None, per_page=50):
+    """Fetch one page (plus one look-ahead row) starting at ``cursor``."""
+    direction, page_queryset = keyset_queryset(queryset, cursor)
+    return build_page(list(page_queryset[:per_page + 1]), direction, cursor, per_page)
+
+
+async def apaginate(queryset, cursor=None, per_page=50):
+    """paginate() for async views, fetched with the async ORM."""
+    direction, page_queryset = keyset_queryset(queryset, cursor)
+    return build_page([obj async for obj in page_queryset[:per_page + 1]], direction, cursor, per_page)
+
+
+def build_page(rows, direction, cursor, per_page):
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if direction == 'before':
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, decode_cursor(cursor) is not None
+
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor('after', rows[-1]) if rows and has_next else None,
+        previous_cursor=encode_cursor('before', rows[0]) if rows and has_previous else None,
+    )
@@ -0,0 +1,33 @@
+from django.core.cache import cache
+
+from .models import Profile
+
+
+PROFILE_CACHE_KEY = 'profiles:summary:{}'
+PROFILE_CACHE_TIMEOUT = 60 * 60
+
+
+# ---------------- Cached Profile Summary ----------------
+def profile_summary(user_id):
+    """
+    The role, name and picture URL base.html needs, cached per user.
+
+    Users without a Profile are cached as an empty dict so they do not query
+    on every page either. dashboard.signals drops the entry when the Profile
+    is saved or deleted.
+    """
+    key = PROFILE_CACHE_KEY.format(user_id)
+    summary = cache.get(key)
+    if summary is None:
+        profile = Profile.objects.filter(user_id=user_id).only('role', 'name', 'profile_picture', 'profile_thumbnail').first()
+        summary = {} if profile is None else {
+            'role': profile.role,
+            'name': profile.name,
+            'picture_url': profile.avatar_url,
+        }
+        cache.set(key, summary, PROFILE_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_profile(user_id):
+    cache.delete(PROFILE_CACHE_KEY.format(user_id))
@@ -0,0 +1,123 @@
+import functools
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HISTORY = 200
+
+_history = deque(maxlen=PROFILE_HISTORY)
+_history_lock = threading.Lock()
+
+IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+# ---------------- SQL Fingerprints ----------------
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """Normalise a query so repeats that differ only in parameters compare equal."""
+    return LITERALS.sub('?', IN_LIST.sub('IN (...)', sql))
+
+
+class QueryRecorder:
+    """execute_wrapper that records each statement's SQL and duration."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    def summary(self, request, response, threshold):
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        repeated = {sql: count for sql, count in counts.items() if count > 1}
+        return {
+            'timestamp': timezone.now(),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'count': len(self.queries),
+            'time_ms': sum(duration for _, duration in self.queries) * 1000,
+            'duplicates': sum(repeated.values()) - len(repeated),
+            'n_plus_one': sorted(
+                ((sql, count) for sql, count in repeated.items() if count >= threshold),
+                key=lambda item: -item[1],
+            ),
+        }
+
+
+# ---------------- Middleware ----------------
+class QueryProfilerMiddleware:
+    """
+    Record query count, DB time and repeated SQL for every request.
+
+    Enabled with DASHBOARD_QUERY_PROFILER = True. Adds X-DB-* response headers,
+    logs likely N+1 patterns (one fingerprint run DASHBOARD_QUERY_PROFILER_N_PLUS_ONE
+    times or more) and keeps the last requests for the superuser report page.
+    Recording is a timer and a list append per query; fingerprints are computed
+    once per request from a cache.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'DASHBOARD_QUERY_PROFILER', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'DASHBOARD_QUERY_PROFILER_N_PLUS_ONE', 5)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with connections['default'].execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        profile = recorder.summary(request, response, self.threshold)
+        response['X-DB-Query-Count'] = str(profile['count'])
+        response['X-DB-Time-Ms'] = f"{profile['time_ms']:.1f}"
+        response['X-DB-Duplicate-Queries'] = str(profile['duplicates'])
+        if profile['n_plus_one']:
+            response['X-DB-N-Plus-One'] = str(len(profile['n_plus_one']))
+            sql, count = profile['n_plus_one'][0]
+            logger.warning("Possible N+1 on %s %s: %d× %s", request.method, request.path, count, sql)
+        with _history_lock:
+            _history.append(profile)
+        return response
+
+
+# ---------------- Report ----------------
+def recent_profiles():
+    with _history_lock:
+        return list(reversed(_history))
+
+
+def clear_profiles():
+    with _history_lock:
+        _history.clear()
+
+
+def summarize_by_path(profiles):
+    """Per-path request count, average and worst query count, and average DB time."""
+    paths = {}
+    for profile in profiles:
+        entry = paths.setdefault(profile['path'], {'path': profile['path'], 'requests': 0,
+                                                   'queries': 0, 'max_queries': 0, 'time_ms': 0.0})
+        entry['requests'] += 1
+        entry['queries'] += profile['count']
+        entry['max_queries'] = max(entry['max_queries'], profile['count'])
+        entry['time_ms'] += profile['time_ms']
+    for entry in paths.values():
+        entry['avg_queries'] = entry['queries'] / entry['requests']
+        entry['avg_time_ms'] = entry['time_ms'] / entry['requests']
+    return sorted(paths.values(), key=lambda entry: -entry['avg_queries'])
@@ -0,0 +1,153 @@
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+from .models import Employee, Task, fold
+
+
+# ---------------- Employee Prefix Search ----------------
+def prefix_range(term):
+    """
+    Bounds ``[term, upper)`` covering every string that starts with ``term``.
+
+    Range comparisons on the folded search columns can use their indexes on
+    Employee, unlike LIKE/ILIKE prefix matches, which most backends cannot index here.
+    """
+    return term, term[:-1] + chr(ord(term[-1]) + 1)
+
+
+def search_employees(term, offset=0, limit=20):
+    """
+    Employees whose name or email starts with ``term`` (case-insensitive).
+
+    The term is folded by the same Python function as the stored search_name and
+    search_email columns, so non-ASCII capitals such as 'Ölga' match too.
+    """
+    term = fold(term.strip())
+    if not term:
+        return Employee.objects.none()
+    low, high = prefix_range(term)
+    return Employee.objects.filter(
+        Q(search_name__gte=low, search_name__lt=high) | Q(search_email__gte=low, search_email__lt=high)
+    ).only('id', 'name', 'email').order_by('search_name', 'id')[offset:offset + limit]
+
+
+# ---------------- Task Full-text Search ----------------
+# Task titles and descriptions are mirrored into an SQLite FTS5 table (created by
+# migration 0009) keyed by task id. dashboard.signals keeps it in sync on save
+# and delete; ``manage.py rebuild_search_index`` repopulates it after bulk loads.
+# Other database backends fall back to an unindexed icontains filter.
+
+FTS_TABLE = 'dashboard_task_fts'
+HIGHLIGHT_START, HIGHLIGHT_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+
+
+def fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def index_tasks(rows):
+    """(Re)index ``(id, title, description)`` rows."""
+    rows = list(rows)
+    if not rows or not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (%s, %s, %s)", rows)
+
+
+def unindex_task(task_id):
+    if fts_enabled():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [task_id])
+
+
+def rebuild_index(batch_size=2000, progress=None):
+    """
+    Repopulate the FTS table from the Task table; returns the number of tasks indexed.
+
+    Tasks are read by primary-key ranges so each batch is an index range scan and
+    memory stays flat however many tasks there are.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    last_id = 0
+    indexed = 0
+    while True:
+        rows = list(
+            Task.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'title', 'description')[:batch_size]
+        )
+        if not rows:
+            break
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.executemany(f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (%s, %s, %s)", rows)
+        last_id = rows[-1][0]
+        indexed += len(rows)
+        if progress:
+            progress(indexed)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    return indexed
+
+
+def match_expression(text):
+    """Turn free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def highlight(text):
+    """Escape indexed text and turn the FTS highlight markers into <mark> tags."""
+    return mark_safe(
+        escape(text).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+    )
+
+
+class TaskHit:
+    def __init__(self, task, title, snippet):
+        self.task = task
+        self.title = title
+        self.snippet = snippet
+
+
+def search_tasks(text, page=1, per_page=20):
+    """
+    Return ``(hits, has_next)`` for one page of tasks matching ``text``, best match first.
+
+    Hits carry the Task plus HTML-safe title and description snippets with the
+    matched words wrapped in <mark>.
+    """
+    offset = (page - 1) * per_page
+    if not fts_enabled():
+        tasks = list(Task.objects.filter(
+            Q(title__icontains=text) | Q(description__icontains=text)
+        ).order_by('-created_at', 'id')[offset:offset + per_page + 1])
+        hits = [TaskHit(task, escape(task.title), escape(Truncator(task.description).words(SNIPPET_TOKENS))) for task in tasks]
+        return hits[:per_page], len(hits) > per_page
+
+    expression = match_expression(text)
+    if not expression:
+        return [], False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, highlight({FTS_TABLE}, 0, %s, %s), "
+            f"snippet({FTS_TABLE}, 1, %s, %s, '…', %s) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s OFFSET %s",
+            [HIGHLIGHT_START, HIGHLIGHT_END, HIGHLIGHT_START, HIGHLIGHT_END, SNIPPET_TOKENS,
+             expression, per_page + 1, offset],
+        )
+        rows = cursor.fetchall()
+    tasks = Task.objects.only('id', 'title', 'status', 'due_date', 'created_at').in_bulk([row[0] for row in rows])
+    hits = [
+        TaskHit(tasks[task_id], highlight(title), highlight(snippet))
+        for task_id, title, snippet in rows[:per_page] if task_id in tasks
+    ]
+    return hits, len(rows) > per_page
@@ -0,0 +1,231 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import activity, fragments, hierarchy, media, notifications, profiles, search, stats, thumbnails
+from .models import Employee, Notification, Profile, Task
+
+
+Assignment = Task.assigned_employees.through
+
+
+# ---------------- Task Stats ----------------
+@receiver(post_init, sender=Task)
+def remember_task_state(sender, instance, **kwargs):
+    # Read from __dict__ so deferred fields are never fetched just to take the snapshot.
+    if instance.pk is None or not {'status', 'due_date'} <= instance.__dict__.keys():
+        instance._stats_state = None
+    else:
+        instance._stats_state = stats.task_state(instance)
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, raw=False, **kwargs):
+    old = None if created else getattr(instance, '_stats_state', None)
+    if raw or (not created and old is None):
+        # Fixture loads and instances loaded with deferred fields: rebuild on next read.
+        stats.invalidate()
+    else:
+        stats.apply_task_change(old, stats.task_state(instance))
+    instance._stats_state = stats.task_state(instance)
+
+
+@receiver(pre_delete, sender=Task)
+def count_deleted_assignments(sender, instance, **kwargs):
+    stats.adjust(assignment_count=-Assignment.objects.filter(task_id=instance.pk).count())
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    old = getattr(instance, '_stats_state', None)
+    if old is None:
+        stats.invalidate()
+    else:
+        stats.apply_task_change(old, None)
+
+
+@receiver(m2m_changed, sender=Assignment)
+def count_assignments(sender, instance, action, reverse, pk_set, **kwargs):
+    side = 'employee_id' if reverse else 'task_id'
+    other = 'task_id__in' if reverse else 'employee_id__in'
+    if action == 'post_add':
+        # Django only reports the links that were actually inserted.
+        stats.adjust(assignment_count=len(pk_set))
+    elif action == 'pre_remove':
+        instance._removed_assignments = Assignment.objects.filter(**{side: instance.pk, other: pk_set}).count()
+    elif action == 'pre_clear':
+        instance._removed_assignments = Assignment.objects.filter(**{side: instance.pk}).count()
+    elif action in ('post_remove', 'post_clear'):
+        stats.adjust(assignment_count=-getattr(instance, '_removed_assignments', 0))
+
+
+@receiver(post_save, sender=Employee)
+def count_created_employee(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        stats.invalidate()
+    elif created:
+        stats.adjust(employee_count=1)
+
+
+@receiver(pre_delete, sender=Employee)
+def count_deleted_employee_assignments(sender, instance, **kwargs):
+    stats.adjust(assignment_count=-Assignment.objects.filter(employee_id=instance.pk).count())
+
+
+@receiver(post_delete, sender=Employee)
+def count_deleted_employee(sender, instance, **kwargs):
+    stats.adjust(employee_count=-1)
+
+
+# ---------------- Task Activity Log ----------------
+@receiver(post_init, sender=Task)
+def remember_logged_status(sender, instance, **kwargs):
+    instance._logged_status = instance.__dict__.get('status') if instance.pk is not None else None
+
+
+@receiver(post_save, sender=Task)
+def log_status_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return  # restored rows come with their own history
+    actor = getattr(instance, activity.ACTOR_ATTR, None)
+    actor_id = actor.pk if actor is not None else None
+    if created:
+        activity.record_created([instance], actor_id)
+    else:
+        activity.record_change(instance, instance._logged_status, actor_id)
+    instance._logged_status = instance.status
+
+
+# ---------------- Task Search Index ----------------
+@receiver(post_save, sender=Task)
+def index_saved_task(sender, instance, **kwargs):
+    search.index_tasks([(instance.pk, instance.title, instance.description)])
+
+
+@receiver(post_delete, sender=Task)
+def unindex_deleted_task(sender, instance, **kwargs):
+    search.unindex_task(instance.pk)
+
+
+# ---------------- Unread Notification Counters ----------------
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_unread_count(sender, instance, **kwargs):
+    notifications.invalidate_unread([instance.user_id])
+
+
+# ---------------- Cached Profile Summary ----------------
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_summary(sender, instance, **kwargs):
+    profiles.invalidate_profile(instance.user_id)
+
+
+# ---------------- Profile Pictures ----------------
+@receiver(post_init, sender=Employee)
+@receiver(post_init, sender=Profile)
+def remember_picture(sender, instance, **kwargs):
+    picture = instance.__dict__.get('profile_picture')
+    instance._picture_name = getattr(picture, 'name', picture) or None
+
+
+@receiver(pre_save, sender=Employee)
+@receiver(pre_save, sender=Profile)
+def remember_picture_upload(sender, instance, **kwargs):
+    # An uncommitted file is written by this save, and DedupStorage takes its reference.
+    picture = instance.profile_picture if 'profile_picture' in instance.__dict__ else None
+    instance._picture_uploaded = bool(picture) and not picture._committed
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Profile)
+def picture_changed(sender, instance, raw=False, **kwargs):
+    if 'profile_picture' not in instance.__dict__:
+        return  # deferred, so this save cannot have changed it
+    name = instance.profile_picture.name or None
+    old = getattr(instance, '_picture_name', None)
+    uploaded = getattr(instance, '_picture_uploaded', False)
+    instance._picture_uploaded = False
+    if name != old:
+        if not uploaded:
+            media.retain(name)
+        media.release(old)
+        if not raw:
+            thumbnails.schedule_thumbnail(instance)
+    elif uploaded:
+        media.release(name)  # the same content again; the field already held a reference
+    instance._picture_name = name
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Profile)
+def release_picture(sender, instance, **kwargs):
+    media.release(getattr(instance, '_picture_name', None))
+
+
+# ---------------- Org Hierarchy ----------------
+@receiver(post_init, sender=Employee)
+def remember_org_position(sender, instance, **kwargs):
+    fields = instance.__dict__
+    if instance.pk is None or not {'manager_id', 'user_id'} <= fields.keys():
+        instance._org_position = None
+    else:
+        instance._org_position = (fields['manager_id'], fields['user_id'])
+
+
+@receiver(pre_save, sender=Employee)
+def refuse_org_cycle(sender, instance, raw=False, **kwargs):
+    old = getattr(instance, '_org_position', None)
+    if raw or (old and old[0] == instance.manager_id):
+        return
+    if hierarchy.would_cycle(instance.pk, instance.manager_id):
+        raise ValueError(f"Employee {instance.pk} cannot report to a user below it in the org tree.")
+
+
+@receiver(post_save, sender=Employee)
+def place_in_hierarchy(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return  # loaddata / restore_data rebuild the paths afterwards
+    old = getattr(instance, '_org_position', None)
+    if created or old is None or old[0] != instance.manager_id:
+        instance.org_path = hierarchy.place(instance.pk)
+    if created or (old is not None and old[1] != instance.user_id):
+        # This row may have been (or now be) the parent of another user's reports,
+        # e.g. a manager whose employee row is created after their reports'.
+        hierarchy.place_reports_of([old[1] if old else None, instance.user_id])
+    instance._org_position = (instance.manager_id, instance.user_id)
+
+
+@receiver(pre_delete, sender=Employee)
+def remember_direct_reports(sender, instance, **kwargs):
+    instance._direct_reports = hierarchy.direct_reports(instance)
+
+
+@receiver(post_delete, sender=Employee)
+def replace_direct_reports(sender, instance, **kwargs):
+    for pk in getattr(instance, '_direct_reports', []):
+        hierarchy.place(pk)
+
+
+# ---------------- Fragment Cache Versions ----------------
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(m2m_changed, sender=Assignment)
+def bump_task_fragments(sender, action='post_save', **kwargs):
+    if action.startswith('post_'):
+        fragments.bump(fragments.TASKS)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def bump_employee_fragments(sender, **kwargs):
+    # Task rows show assignee names, so both sets change.
+    fragments.bump(fragments.EMPLOYEES, fragments.TASKS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_user_fragments(sender, update_fields=None, **kwargs):
+    # The employee cards show the login's username and email; logins only touch last_login.
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        fragments.bump(fragments.EMPLOYEES)
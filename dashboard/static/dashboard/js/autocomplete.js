@@ -0,0 +1,20 @@
+// Select2 on every <select data-autocomplete-url>, loading options from the JSON endpoint.
+$(function () {
+    $('select[data-autocomplete-url]').each(function () {
+        var $select = $(this);
+        $select.select2({
+            placeholder: $select.prop('multiple') ? 'Select employees' : 'Anyone',
+            allowClear: true,
+            width: '100%',
+            minimumInputLength: 1,
+            ajax: {
+                url: $select.data('autocomplete-url'),
+                dataType: 'json',
+                delay: 250,
+                data: function (params) {
+                    return { q: params.term, page: params.page || 1 };
+                }
+            }
+        });
+    });
+});
@@ -0,0 +1,268 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import Employee, Task, TaskDueDateBucket, TaskStats
+
+
+OPEN_STATUSES = (Task.STATUS_PENDING, Task.STATUS_IN_PROGRESS)
+STATS_PK = 1
+
+STATUS_COUNTERS = {
+    Task.STATUS_PENDING: 'pending_count',
+    Task.STATUS_IN_PROGRESS: 'in_progress_count',
+    Task.STATUS_COMPLETED: 'completed_count',
+}
+
+
+# ---------------- Dashboard Counters ----------------
+def counter_filters(today):
+    """Filter for every task counter shown on the admin dashboard, keyed by context name."""
+    return {
+        'task_count': Q(),
+        'overdue_count': Q(due_date__lt=today, status__in=OPEN_STATUSES),
+        'no_deadline_count': Q(due_date__isnull=True),
+        'due_today_count': Q(due_date=today),
+        'pending_count': Q(status=Task.STATUS_PENDING),
+        'in_progress_count': Q(status=Task.STATUS_IN_PROGRESS),
+        'completed_count': Q(status=Task.STATUS_COMPLETED),
+    }
+
+
+def compute_counters(today=None):
+    """
+    Compute all dashboard counters with one conditional-aggregation pass over Task
+    plus one count over Employee.
+    """
+    today = today or timezone.now().date()
+    aggregates = {
+        name: Count('id', filter=condition) if condition else Count('id')
+        for name, condition in counter_filters(today).items()
+    }
+    counters = Task.objects.aggregate(**aggregates)
+    counters['employee_count'] = Employee.objects.count()
+    return counters
+
+
+def read_counters(today=None):
+    """
+    Read the dashboard counters from the TaskStats summary row.
+
+    Costs one lookup for the summary row and one for today's due-date bucket;
+    the overdue counter is rolled forward from the buckets when the day changes.
+    """
+    today = today or timezone.now().date()
+    row = TaskStats.objects.filter(pk=STATS_PK).first()
+    if row is None:
+        row = rebuild(today)
+    elif row.as_of != today:
+        row = roll_over(row, today)
+
+    bucket = TaskDueDateBucket.objects.filter(due_date=today).values_list('task_count', flat=True).first()
+    return counters_from(row, bucket)
+
+
+async def aread_counters(today=None):
+    """
+    read_counters() for async views: the summary row and today's bucket are
+    requested together. A missing or out-of-date row falls back to the sync path.
+    """
+    today = today or timezone.now().date()
+    row, bucket = await asyncio.gather(
+        TaskStats.objects.filter(pk=STATS_PK).afirst(),
+        TaskDueDateBucket.objects.filter(due_date=today).values_list('task_count', flat=True).afirst(),
+    )
+    if row is None or row.as_of != today:
+        return await sync_to_async(read_counters)(today)
+    return counters_from(row, bucket)
+
+
+def counters_from(row, due_today):
+    return {
+        'employee_count': row.employee_count,
+        'task_count': row.task_count,
+        'overdue_count': row.overdue_count,
+        'no_deadline_count': row.no_deadline_count,
+        'due_today_count': due_today or 0,
+        'pending_count': row.pending_count,
+        'in_progress_count': row.in_progress_count,
+        'completed_count': row.completed_count,
+    }
+
+
+def roll_over(row, today):
+    """Move ``overdue_count`` from ``row.as_of`` to ``today`` using only the buckets in between."""
+    if row.as_of < today:
+        newly_due = TaskDueDateBucket.objects.filter(due_date__gte=row.as_of, due_date__lt=today)
+        sign = 1
+    else:
+        newly_due = TaskDueDateBucket.objects.filter(due_date__gte=today, due_date__lt=row.as_of)
+        sign = -1
+    delta = sign * (newly_due.aggregate(total=Sum('open_count'))['total'] or 0)
+
+    # Only the request that still sees the old date applies the delta.
+    updated = TaskStats.objects.filter(pk=STATS_PK, as_of=row.as_of).update(
+        overdue_count=F('overdue_count') + delta, as_of=today
+    )
+    if not updated:
+        current = TaskStats.objects.get(pk=STATS_PK)
+        return current if current.as_of == today else roll_over(current, today)
+    row.overdue_count += delta
+    row.as_of = today
+    return row
+
+
+# ---------------- Maintenance ----------------
+def task_state(task):
+    """The part of a task the counters depend on."""
+    return (task.status, task.due_date)
+
+
+def apply_task_change(old, new):
+    """
+    Move one task's contribution from ``old`` to ``new`` state.
+
+    Either side may be ``None`` for a task that is being created or deleted.
+    """
+    if old == new:
+        return
+    deltas = {}
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        status, due_date = state
+        deltas['task_count'] = deltas.get('task_count', 0) + sign
+        counter = STATUS_COUNTERS.get(status)
+        if counter:
+            deltas[counter] = deltas.get(counter, 0) + sign
+        if due_date is None:
+            deltas['no_deadline_count'] = deltas.get('no_deadline_count', 0) + sign
+        else:
+            is_open = status in OPEN_STATUSES
+            adjust_bucket(due_date, sign, sign if is_open else 0)
+            if is_open:
+                adjust_overdue(due_date, sign)
+    adjust(**deltas)
+
+
+def apply_bulk_status_change(queryset, new_status):
+    """
+    Account for ``queryset.update(status=new_status)`` before it runs.
+
+    Set-based counterpart of apply_task_change for bulk updates, which send no
+    signals: a few grouped aggregates instead of one adjustment per task.
+    """
+    changing = queryset.exclude(status=new_status)
+    deltas = {}
+    moved = 0
+    for row in changing.values('status').annotate(n=Count('id')).order_by():
+        counter = STATUS_COUNTERS.get(row['status'])
+        if counter:
+            deltas[counter] = deltas.get(counter, 0) - row['n']
+        moved += row['n']
+    if not moved:
+        return
+    new_counter = STATUS_COUNTERS.get(new_status)
+    if new_counter:
+        deltas[new_counter] = deltas.get(new_counter, 0) + moved
+
+    # Tasks switching between open and closed move between the open buckets and overdue.
+    if new_status in OPEN_STATUSES:
+        flipping, sign = changing.exclude(status__in=OPEN_STATUSES), 1
+    else:
+        flipping, sign = changing.filter(status__in=OPEN_STATUSES), -1
+    flipping = flipping.filter(due_date__isnull=False)
+    for row in flipping.values('due_date').annotate(n=Count('id')).order_by():
+        adjust_bucket(row['due_date'], 0, sign * row['n'])
+    as_of = TaskStats.objects.filter(pk=STATS_PK).values_list('as_of', flat=True).first()
+    if as_of is not None:
+        deltas['overdue_count'] = sign * flipping.filter(due_date__lt=as_of).count()
+    adjust(**deltas)
+
+
+def adjust(**deltas):
+    """Atomically add ``deltas`` to the summary row; a missing row is rebuilt on next read."""
+    deltas = {name: F(name) + value for name, value in deltas.items() if value}
+    if deltas:
+        TaskStats.objects.filter(pk=STATS_PK).update(**deltas)
+
+
+def adjust_overdue(due_date, delta):
+    """Count an open task as overdue if it was already due before the row's ``as_of`` date."""
+    TaskStats.objects.filter(pk=STATS_PK).update(
+        overdue_count=F('overdue_count') + Case(
+            When(as_of__gt=due_date, then=Value(delta)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def adjust_bucket(due_date, task_delta, open_delta):
+    updates = {'task_count': F('task_count') + task_delta, 'open_count': F('open_count') + open_delta}
+    if TaskDueDateBucket.objects.filter(due_date=due_date).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            TaskDueDateBucket.objects.create(due_date=due_date, task_count=task_delta, open_count=open_delta)
+    except IntegrityError:
+        TaskDueDateBucket.objects.filter(due_date=due_date).update(**updates)
+
+
+# ---------------- Rebuild / Drift ----------------
+def invalidate():
+    """Drop the summary row so the next read rebuilds it from the tables."""
+    TaskStats.objects.filter(pk=STATS_PK).delete()
+
+
+def summarize(today):
+    """Compute the full TaskStats row and bucket list from scratch."""
+    counters = compute_counters(today)
+    counters.pop('due_today_count')
+    counters['assignment_count'] = Task.assigned_employees.through.objects.count()
+    buckets = [
+        TaskDueDateBucket(due_date=row['due_date'], task_count=row['task_count'], open_count=row['open_count'])
+        for row in Task.objects.filter(due_date__isnull=False).values('due_date').annotate(
+            task_count=Count('id'),
+            open_count=Count('id', filter=Q(status__in=OPEN_STATUSES)),
+        ).order_by('due_date')
+    ]
+    return counters, buckets
+
+
+@transaction.atomic
+def rebuild(today=None):
+    today = today or timezone.now().date()
+    counters, buckets = summarize(today)
+    TaskDueDateBucket.objects.all().delete()
+    TaskDueDateBucket.objects.bulk_create(buckets, batch_size=1000)
+    row, _ = TaskStats.objects.update_or_create(pk=STATS_PK, defaults=dict(counters, as_of=today))
+    return row
+
+
+def find_drift(today=None):
+    """Return ``{name: (stored, actual)}`` for every counter or bucket that disagrees with the tables."""
+    today = today or timezone.now().date()
+    row = TaskStats.objects.filter(pk=STATS_PK).first()
+    if row is None:
+        return {'row': (None, 'missing')}
+    if row.as_of != today:
+        row = roll_over(row, today)
+
+    counters, buckets = summarize(today)
+    drift = {
+        name: (getattr(row, name), value)
+        for name, value in counters.items() if getattr(row, name) != value
+    }
+    stored = {
+        bucket.due_date: (bucket.task_count, bucket.open_count)
+        for bucket in TaskDueDateBucket.objects.exclude(task_count=0, open_count=0)
+    }
+    actual = {bucket.due_date: (bucket.task_count, bucket.open_count) for bucket in buckets}
+    for due_date in stored.keys() | actual.keys():
+        if stored.get(due_date) != actual.get(due_date):
+            drift[f'bucket {due_date}'] = (stored.get(due_date), actual.get(due_date))
+    return drift
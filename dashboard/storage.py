@@ -0,0 +1,60 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils.deconstruct import deconstructible
+
+
+BLOB_NAME = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{64}(\.[\w]+)?$')
+
+
+# ---------------- Content-addressed Storage ----------------
+@deconstructible
+class DedupStorage(FileSystemStorage):
+    """
+    File system storage that names each file after the SHA-256 of its content.
+
+    ``profile_pics/photo.png`` is stored as ``profile_pics/ab/ab12….png``, so the
+    same upload saved on both a Profile and an Employee, or uploaded twice, is
+    written once. MediaBlob reference counts (see retain/release) decide when a
+    blob may be removed; saving a blob takes the reference for the upload.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is decided from the content in _save. A blob that appeared
+        # since then holds the same bytes, so FileSystemStorage must not retry with
+        # another name; _save treats it as already written.
+        if is_blob(name) and self.exists(name):
+            raise FileExistsError(name)
+        return name
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+        extension = os.path.splitext(name)[1].lower()
+        name = posixpath.join(posixpath.dirname(name), digest[:2], digest + extension)
+        from . import media
+
+        # The reference is taken before the file is checked, in one transaction,
+        # so media._delete_if_unreferenced either sees it or has already finished.
+        with transaction.atomic():
+            media.retain(name)
+            if not self.exists(name):
+                content.seek(0)
+                try:
+                    super()._save(name, content)
+                except FileExistsError:
+                    pass  # written by a concurrent upload of the same content
+        return name
+
+
+def is_blob(name):
+    return bool(name) and bool(BLOB_NAME.search(name))
+
+
+profile_picture_storage = DedupStorage()
@@ -0,0 +1,70 @@
+import codecs
+import io
+import json
+
+
+READ_SIZE = 1 << 16
+
+
+# ---------------- Streaming Readers ----------------
+def text_stream(binary):
+    """
+    Wrap a binary file in a text reader, honouring a UTF-8 or UTF-16 byte-order mark.
+
+    ``dumpdata > file`` on Windows writes UTF-16, so sniff before assuming UTF-8.
+    """
+    binary = binary if isinstance(binary, io.BufferedReader) else io.BufferedReader(binary)
+    head = binary.peek(4)[:4]
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = 'utf-16'
+    else:
+        encoding = 'utf-8-sig'
+    return io.TextIOWrapper(binary, encoding=encoding, newline='')
+
+
+def iter_json_records(fp, read_size=READ_SIZE):
+    """
+    Yield the values of a top-level JSON array, or of a JSON Lines stream, one at a time.
+
+    Only the current record is held in memory, so arbitrarily large files can be read.
+    Raises ValueError for malformed input, including an array that is never closed.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+    in_array = None
+
+    while True:
+        buffer = buffer.lstrip()
+        if in_array and buffer[:1] == ',':
+            buffer = buffer[1:]
+            continue
+        if in_array and buffer[:1] == ']':
+            return
+        if in_array is None and buffer[:1] == '[':
+            in_array = True
+            buffer = buffer[1:]
+            continue
+
+        if buffer:
+            if in_array is None:
+                in_array = False
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f"Malformed JSON near: {buffer[:80]!r}")
+            else:
+                yield value
+                buffer = buffer[end:]
+                continue
+        elif eof:
+            if in_array:
+                raise ValueError("JSON array is not terminated.")
+            return
+
+        chunk = fp.read(read_size)
+        if chunk:
+            buffer += chunk
+        else:
+            eof = True
@@ -1,3 +1,1083 @@
-from django.test import TestCase # type: ignore
+from datetime import timedelta
 
-# Create your tests here.
+import codecs
+import csv
+import io
+import json
+import re
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import OperationalError, connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings # type: ignore
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import empty
+
+from . import activity, backups, bulk, db, demo, directory, exports, fragments, hierarchy, importers, media, notifications, outbox, profiles, profiling, search, stats, thumbnails, views
+from .management.commands import bench_urls
+from .models import Employee, MediaBlob, Notification, OutboundEmail, Profile, Task, TaskEvent
+from .forms import EmployeeForm, TaskFilterForm
+from .pagination import encode_cursor, keyset_queryset, paginate
+from .storage import DedupStorage
+from .streams import iter_json_records
+from .views import employee_task_feed
+
+
+class DashboardCountersTests(TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        yesterday = self.today - timedelta(days=1)
+        Employee.objects.create(name='Asha')
+        Task.objects.create(title='Late', description='', due_date=yesterday, status=Task.STATUS_PENDING)
+        Task.objects.create(title='Late but done', description='', due_date=yesterday, status=Task.STATUS_COMPLETED)
+        Task.objects.create(title='Today', description='', due_date=self.today, status=Task.STATUS_IN_PROGRESS)
+        Task.objects.create(title='Someday', description='')
+
+    def test_counters_in_two_queries(self):
+        with self.assertNumQueries(2):
+            counters = stats.compute_counters(self.today)
+        self.assertEqual(counters, {
+            'employee_count': 1,
+            'task_count': 4,
+            'overdue_count': 1,
+            'no_deadline_count': 1,
+            'due_today_count': 1,
+            'pending_count': 2,
+            'in_progress_count': 1,
+            'completed_count': 1,
+        })
+
+
+class TaskStatsTests(TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.employee = Employee.objects.create(name='Asha')
+        stats.rebuild(self.today)
+
+    def assertConsistent(self, today):
+        self.assertEqual(stats.read_counters(today), stats.compute_counters(today))
+        self.assertEqual(stats.find_drift(today), {})
+
+    def test_signals_keep_summary_in_sync(self):
+        task = Task.objects.create(title='A', description='', due_date=self.today)
+        other = Task.objects.create(title='B', description='', due_date=self.today - timedelta(days=2))
+        task.assigned_employees.add(self.employee)
+        self.employee.tasks.add(other)
+        self.assertConsistent(self.today)
+
+        task.status = Task.STATUS_COMPLETED
+        task.due_date = None
+        task.save()
+        task.assigned_employees.remove(self.employee)
+        self.assertConsistent(self.today)
+
+        other.delete()
+        Employee.objects.create(name='Ravi')
+        self.assertConsistent(self.today)
+
+    def test_summary_read_is_constant_cost(self):
+        for i in range(5):
+            Task.objects.create(title=str(i), description='', due_date=self.today)
+        with self.assertNumQueries(2):
+            stats.read_counters(self.today)
+
+    def test_overdue_rolls_over_at_midnight(self):
+        Task.objects.create(title='Due today', description='', due_date=self.today)
+        Task.objects.create(title='Due tomorrow', description='', due_date=self.today + timedelta(days=1))
+        Task.objects.create(title='Done', description='', due_date=self.today, status=Task.STATUS_COMPLETED)
+        self.assertEqual(stats.read_counters(self.today)['overdue_count'], 0)
+
+        for days in (1, 2, 5, 0):
+            self.assertConsistent(self.today + timedelta(days=days))
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for i in range(7):
+            Task.objects.create(title=f'Task {i}', description='')
+        # Force ties on created_at so the id tiebreaker is exercised.
+        Task.objects.filter(title__in=['Task 2', 'Task 3', 'Task 4']).update(created_at=now)
+        self.expected = list(Task.objects.order_by('-created_at', 'id').values_list('id', flat=True))
+
+    def ids(self, page):
+        return [task.id for task in page]
+
+    def test_walk_forward_and_back(self):
+        pages, cursor = [], None
+        while True:
+            page = paginate(Task.objects.all(), cursor, per_page=3)
+            pages.append(self.ids(page))
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertEqual([len(ids) for ids in pages], [3, 3, 1])
+
+        page = paginate(Task.objects.all(), page.previous_cursor, per_page=3)
+        self.assertEqual(self.ids(page), pages[1])
+        page = paginate(Task.objects.all(), page.previous_cursor, per_page=3)
+        self.assertEqual(self.ids(page), pages[0])
+        self.assertFalse(page.has_previous)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are checked with SQLite EXPLAIN QUERY PLAN.')
+    def test_cursor_pages_are_index_range_searches(self):
+        task = Task.objects.order_by('-created_at', 'id')[3]
+        for direction in ('after', 'before'):
+            with self.subTest(direction):
+                _, queryset = keyset_queryset(Task.objects.all(), encode_cursor(direction, task))
+                plan = queryset[:4].explain()
+                # One ordered range over the index: no OR branches, no scan, no sort.
+                self.assertRegex(plan, r'SEARCH dashboard_task USING (COVERING )?INDEX task_created_id_idx \(created_at[<>]\?\)')
+                self.assertNotRegex(plan, r'MULTI-INDEX OR|SCAN dashboard_task|TEMP B-TREE')
+
+    def test_malformed_cursor_starts_from_first_page(self):
+        page = paginate(Task.objects.all(), 'not-a-cursor', per_page=3)
+        self.assertEqual(self.ids(page), self.expected[:3])
+
+    def test_all_tasks_view_filters(self):
+        employee = Employee.objects.create(name='Asha')
+        task = Task.objects.get(title='Task 5')
+        task.assigned_employees.add(employee)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.get(reverse('all_tasks'), {'assignee': employee.pk})
+        self.assertEqual(list(response.context['page'].object_list), [task])
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are checked with SQLite EXPLAIN QUERY PLAN.')
+class TaskQueryPlanTests(TestCase):
+    """Fail if a hot-path Task query stops using an index and falls back to a full table scan."""
+
+    # Any SCAN, including an index walk ("SCAN t USING INDEX ..."), reads rows in
+    # proportion to the table; a plain ordered first page stops after its LIMIT.
+    FULL_SCAN = re.compile(r'\bSCAN (dashboard_task\w*)\b')
+    LIMITED_SCANS = {'all_tasks first page'}
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.user = User.objects.create_user('manager')
+        self.employee = Employee.objects.create(name='Asha')
+        task = Task.objects.create(title='Seed', description='', assigned_by=self.user)
+        task.assigned_employees.add(self.employee)
+        self.cursor = encode_cursor('after', task)
+
+    def page(self, filters=None, cursor=None):
+        form = TaskFilterForm(filters)
+        _, queryset = keyset_queryset(form.filter_queryset(Task.objects.all()), cursor)
+        return queryset[:51]
+
+    def hot_path_querysets(self):
+        open_statuses = stats.OPEN_STATUSES
+        return {
+            'all_tasks first page': self.page(),
+            'all_tasks next page': self.page(cursor=self.cursor),
+            'all_tasks by status': self.page({'status': 'pending'}, self.cursor),
+            'all_tasks by due range': self.page({'due_from': self.today, 'due_to': self.today}),
+            'all_tasks by assignee': self.page({'assignee': self.employee.pk}),
+            'open tasks by due date': Task.objects.filter(
+                due_date__lt=self.today, status__in=open_statuses
+            ).order_by('due_date'),
+            'tasks due today': Task.objects.filter(due_date=self.today),
+            'tasks assigned by manager': Task.objects.filter(assigned_by=self.user).order_by('-created_at')[:50],
+            'employee feed': keyset_queryset(employee_task_feed(self.employee.pk))[1][:51],
+            'dashboard summary': stats.TaskStats.objects.filter(pk=stats.STATS_PK),
+            'dashboard due today bucket': stats.TaskDueDateBucket.objects.filter(due_date=self.today),
+        }
+
+    def test_no_sequential_scans(self):
+        for name, queryset in self.hot_path_querysets().items():
+            with self.subTest(name):
+                plan = queryset.explain()
+                if name in self.LIMITED_SCANS:
+                    self.assertNotIn('TEMP B-TREE', plan, f'{name} sorts instead of walking an index:\n{plan}')
+                    continue
+                self.assertIsNone(self.FULL_SCAN.search(plan), f'{name} scans a whole table:\n{plan}')
+
+
+class EmployeeFeedTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('asha@example.com', password='secret')
+        self.employee = Employee.objects.create(user=user, name='Asha')
+        other = Employee.objects.create(name='Ravi')
+        self.mine = Task.objects.create(title='Mine', description='')
+        self.mine.assigned_employees.add(self.employee, other)
+        Task.objects.create(title='Not mine', description='').assigned_employees.add(other)
+
+    def test_login_scopes_feed_to_employee(self):
+        response = self.client.post(reverse('employee_login'), {'username': 'asha@example.com', 'password': 'secret'})
+        self.assertRedirects(response, reverse('employee_dashboard'))
+        response = self.client.get(reverse('employee_dashboard'))
+        self.assertEqual(list(response.context['tasks']), [self.mine])
+
+    def test_unlinked_user_cannot_log_in(self):
+        User.objects.create_user('admin', password='secret')
+        response = self.client.post(reverse('employee_login'), {'username': 'admin', 'password': 'secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertRedirects(self.client.get(reverse('employee_dashboard')), reverse('employee_login'))
+
+
+class FlakyEmailBackend(EmailBackend):
+    """locmem backend that refuses mail for one address."""
+
+    def send_messages(self, messages):
+        if any('bounce@example.com' in message.to for message in messages):
+            raise OSError('mailbox unavailable')
+        return super().send_messages(messages)
+
+
+class OutboxTests(TestCase):
+    def test_add_employee_queues_welcome_mail(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.post(reverse('add_employee'), {
+            'name': 'Asha', 'email': 'asha@example.com', 'phone': '123', 'role': 'employee',
+        })
+        self.assertRedirects(response, reverse('employee_list'), fetch_redirect_response=False)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.get().recipients, 'asha@example.com')
+
+        self.assertEqual(outbox.deliver_batch(), (1, 0))
+        self.assertEqual(mail.outbox[0].subject, 'Welcome to TaskPro')
+        self.assertIn('Password: ', mail.outbox[0].body)
+        self.assertEqual(OutboundEmail.objects.values_list('status', 'body').get(), (OutboundEmail.STATUS_SENT, ''))
+
+    @override_settings(EMAIL_BACKEND='dashboard.tests.FlakyEmailBackend')
+    def test_failures_back_off_without_blocking_the_batch(self):
+        outbox.queue_mail('Hi', 'body', ['bounce@example.com'])
+        outbox.queue_mail('Hi', 'body', ['ok@example.com'])
+        self.assertEqual(outbox.deliver_batch(), (1, 1))
+
+        failed = OutboundEmail.objects.get(recipients='bounce@example.com')
+        self.assertEqual((failed.status, failed.attempts), (OutboundEmail.STATUS_QUEUED, 1))
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+        # Not due again until the backoff expires.
+        self.assertEqual(outbox.deliver_batch(), (0, 0))
+
+
+@override_settings(DASHBOARD_BACKGROUND_INLINE=True)
+class TaskAlertFanOutTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.employees = [
+            Employee.objects.create(name=f'Employee {i}', user=User.objects.create_user(f'user{i}'))
+            for i in range(5)
+        ]
+        Employee.objects.create(name='No login')
+        self.client.force_login(self.admin)
+
+    def test_create_task_with_alert_fans_out_in_chunks(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('create_task'), {
+                'title': 'Ship it', 'description': 'now', 'status': 'pending',
+                'assigned_employees': [e.pk for e in Employee.objects.all()], 'alert_all': 'on',
+            })
+        task = Task.objects.get()
+        self.assertEqual(
+            set(Notification.objects.filter(task=task).values_list('user_id', flat=True)),
+            {e.user_id for e in self.employees},
+        )
+        self.assertEqual(Notification.objects.count(), 5)
+
+        Notification.objects.all().delete()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(notifications.fan_out_task_alert(task.pk, False, 'admin', chunk_size=2), 5)
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 3)
+
+    def test_no_alert_without_flag(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('create_task'), {
+                'title': 'Quiet', 'description': '', 'status': 'pending',
+                'assigned_employees': [self.employees[0].pk],
+            })
+        self.assertFalse(Notification.objects.exists())
+
+
+class UnreadNotificationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('asha')
+        self.task = Task.objects.create(title='T', description='')
+        for _ in range(3):
+            Notification.objects.create(user=self.user, task=self.task, message='hi')
+
+    def test_unread_count_is_cached_and_invalidated(self):
+        self.assertEqual(notifications.unread_count(self.user.pk), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.unread_count(self.user.pk), 3)
+
+        Notification.objects.create(user=self.user, message='one more')
+        self.assertEqual(notifications.unread_count(self.user.pk), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications._insert([Notification(user=self.user, message='bulk')])
+        self.assertEqual(notifications.unread_count(self.user.pk), 5)
+
+    def test_mark_all_read_is_one_update(self):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('mark_notifications_read'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json(), {'marked': 3, 'unread': 0})
+        self.assertEqual(len([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE "dashboard_notification"')]), 1)
+        self.assertEqual(notifications.unread_count(self.user.pk), 0)
+        self.assertContains(self.client.get(reverse('notifications')), 'Mark all read')
+        self.assertContains(self.client.get(reverse('alerted_tasks')), 'Edit Task', count=3)
+
+    def test_mark_all_read_answers_api_clients_with_json(self):
+        self.client.force_login(self.user)
+        url = reverse('mark_notifications_read')
+        self.assertEqual(self.client.post(url, HTTP_ACCEPT='*/*').json(), {'marked': 3, 'unread': 0})
+        browser = 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+        self.assertRedirects(self.client.post(url, HTTP_ACCEPT=browser), reverse('notifications'))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class EmployeeImportTests(TestCase):
+    CSV = (
+        'name,email,phone,role\n'
+        'Asha,asha@example.com,111,employee\n'
+        'Ravi,not-an-email,222,employee\n'
+        'Meena,meena@example.com,333,manager\n'
+        'Asha again,ASHA@example.com,444,employee\n'
+        'Taken,taken@example.com,555,employee\n'
+        'Kumar,kumar@example.com,666,wizard\n'
+    )
+
+    def setUp(self):
+        User.objects.create_user('taken@example.com', 'taken@example.com')
+        stats.rebuild()
+
+    def test_csv_upload_reports_row_errors_without_aborting(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        upload = SimpleUploadedFile('staff.csv', self.CSV.encode(), content_type='text/csv')
+        response = self.client.post(reverse('import_employees'), {'file': upload})
+
+        result = response.context['result']
+        self.assertEqual(result.created, 2)
+        self.assertEqual([row for row, _ in result.errors], [2, 4, 5, 6])
+        self.assertEqual(
+            set(Employee.objects.values_list('email', flat=True)), {'asha@example.com', 'meena@example.com'}
+        )
+        self.assertEqual(Profile.objects.get(email='meena@example.com').role, 'manager')
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+        self.assertEqual(stats.find_drift(), {})
+
+    def test_large_upload_is_sent_to_the_management_command(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        rows = ''.join(f'Person {i},p{i}@example.com,1,employee\n' for i in range(views.IMPORT_MAX_ROWS + 1))
+        upload = SimpleUploadedFile('staff.csv', ('name,email,phone,role\n' + rows).encode(), content_type='text/csv')
+        response = self.client.post(reverse('import_employees'), {'file': upload})
+        self.assertIn('manage.py import_employees', response.context['form'].errors['file'][0])
+        self.assertFalse(Employee.objects.exists())
+
+    def test_json_lines_in_batches_with_process_pool(self):
+        lines = '\n'.join(
+            '{"name": "Person %d", "email": "p%d@example.com"}' % (i, i) for i in range(7)
+        )
+        result = importers.import_employees(
+            importers.read_records(io.StringIO(lines), 'json'), batch_size=3, workers=2, send_welcome=False
+        )
+        self.assertEqual((result.created, result.errors), (7, []))
+        user = User.objects.get(username='p6@example.com')
+        self.assertTrue(user.password.startswith('md5$'))
+        self.assertTrue(Employee.objects.filter(user=user, role='employee').exists())
+
+    def test_json_numbers_are_text_and_other_values_are_row_errors(self):
+        lines = (
+            '{"name": "Asha", "email": "asha@example.com", "phone": 5551234}\n'
+            '{"name": ["Ravi"], "email": "ravi@example.com"}\n'
+        )
+        result = importers.import_employees(
+            importers.read_records(io.StringIO(lines), 'json'), send_welcome=False
+        )
+        self.assertEqual((result.created, [row for row, _ in result.errors]), (1, [2]))
+        self.assertEqual(Employee.objects.get(email='asha@example.com').phone, '5551234')
+
+
+class BulkTaskUpdateTests(TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.asha = Employee.objects.create(name='Asha')
+        self.ravi = Employee.objects.create(name='Ravi')
+        self.tasks = [
+            Task.objects.create(title=str(i), description='', due_date=self.today - timedelta(days=i % 3))
+            for i in range(6)
+        ]
+        self.tasks[0].assigned_employees.add(self.asha)
+        self.tasks[1].assigned_employees.add(self.asha, self.ravi)
+        stats.rebuild(self.today)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def post(self, payload):
+        return self.client.post(reverse('bulk_update_tasks'), json.dumps(payload), content_type='application/json')
+
+    def test_status_and_assignment_in_set_based_statements(self):
+        ids = [task.pk for task in self.tasks[:4]]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post({
+                'task_ids': ids + [999], 'status': 'completed', 'assign': [self.ravi.pk], 'unassign': [self.asha.pk],
+            })
+        self.assertEqual(response.json(), {'tasks': 4, 'status_updated': 4, 'assigned': 3, 'unassigned': 2})
+        writes = [q['sql'].split()[0] for q in ctx.captured_queries if not q['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE'))]
+        # The new assignments and the activity log entries.
+        self.assertEqual(writes.count('INSERT'), 2)
+        self.assertEqual(writes.count('DELETE'), 1)
+
+        self.assertEqual(Task.objects.filter(status='completed').count(), 4)
+        self.assertEqual(set(Employee.objects.filter(tasks__in=ids).values_list('name', flat=True)), {'Ravi'})
+        self.assertEqual(stats.find_drift(self.today), {})
+        self.assertEqual(stats.read_counters(self.today), stats.compute_counters(self.today))
+
+    def test_reopening_tasks_restores_overdue(self):
+        self.post({'task_ids': [t.pk for t in self.tasks], 'status': 'completed'})
+        self.post({'task_ids': [t.pk for t in self.tasks], 'status': 'in_progress'})
+        self.assertEqual(stats.find_drift(self.today), {})
+
+    def test_rejects_bad_input(self):
+        self.assertEqual(self.post({'task_ids': ['x']}).status_code, 400)
+        self.assertEqual(self.post({'task_ids': [1], 'status': 'archived'}).status_code, 400)
+        pk = str(self.tasks[0].pk)
+        self.assertEqual(self.post({'task_ids': pk + pk, 'status': 'completed'}).status_code, 400)
+        self.assertEqual(self.post({'task_ids': [pk], 'assign': self.asha.pk}).status_code, 400)
+        self.assertFalse(Task.objects.filter(status='completed').exists())
+
+
+class EmployeeAutocompleteTests(TestCase):
+    def setUp(self):
+        Employee.objects.bulk_create([Employee(name=f'Person {i}', email=f'p{i}@example.com') for i in range(30)])
+        self.asha = Employee.objects.create(name='Asha Rao', email='asha@example.com')
+        Employee.objects.create(name='Bala', email='ASHOK@example.com')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_prefix_search_over_name_and_email(self):
+        response = self.client.get(reverse('employee_autocomplete'), {'q': 'AS'})
+        self.assertEqual([r['text'] for r in response.json()['results']], [
+            'Asha Rao (asha@example.com)', 'Bala (ASHOK@example.com)',
+        ])
+
+    def test_paging(self):
+        first = self.client.get(reverse('employee_autocomplete'), {'q': 'person'}).json()
+        second = self.client.get(reverse('employee_autocomplete'), {'q': 'person', 'page': 2}).json()
+        self.assertEqual((len(first['results']), first['pagination']['more']), (20, True))
+        self.assertEqual((len(second['results']), second['pagination']['more']), (10, False))
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'Query plans are checked with SQLite EXPLAIN QUERY PLAN.')
+    def test_search_uses_folded_key_indexes(self):
+        plan = search.search_employees('as').explain()
+        self.assertIn('employee_search_name_idx', plan)
+        self.assertIn('employee_search_email_idx', plan)
+
+    def test_non_ascii_capitals_match_by_prefix(self):
+        Employee.objects.create(name='Ölga Berg', email='olga@example.com')
+        Employee.objects.bulk_create([Employee(name='Álvaro Ruiz', email='ÉMILE@example.com')])
+        self.assertEqual([e.name for e in search.search_employees('öl')], ['Ölga Berg'])
+        self.assertEqual([e.name for e in search.search_employees('ÁLV')], ['Álvaro Ruiz'])
+        self.assertEqual([e.name for e in search.search_employees('émi')], ['Álvaro Ruiz'])
+
+    def test_task_form_renders_only_selected_employees(self):
+        task = Task.objects.create(title='T', description='')
+        task.assigned_employees.add(self.asha)
+        response = self.client.get(reverse('edit_task', args=[task.pk]))
+        self.assertContains(response, '<option value="%d" selected>Asha Rao</option>' % self.asha.pk, html=True)
+        self.assertNotContains(response, 'Person 1')
+        self.assertContains(self.client.get(reverse('create_task')), 'data-autocomplete-url')
+
+    def test_non_numeric_selection_is_a_validation_error(self):
+        for value in ('abc', '²'):
+            self.assertEqual(self.client.get(reverse('all_tasks'), {'assignee': value}).status_code, 200)
+        task = Task.objects.create(title='T', description='')
+        response = self.client.post(reverse('edit_task', args=[task.pk]), {
+            'title': 'T', 'description': '', 'status': Task.STATUS_PENDING, 'assigned_employees': ['abc', '²'],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors['assigned_employees'])
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'The task search index is an SQLite FTS5 table.')
+class TaskSearchTests(TestCase):
+    def setUp(self):
+        self.invoice = Task.objects.create(title='Send invoices', description='Email the <b>monthly</b> invoices to clients')
+        self.report = Task.objects.create(title='Quarterly report', description='Summarise invoice totals')
+        Task.objects.create(title='Water plants', description='')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_ranked_prefix_search_with_highlighting(self):
+        hits, has_next = search.search_tasks('invoice')
+        self.assertEqual([hit.task for hit in hits], [self.invoice, self.report])
+        self.assertFalse(has_next)
+        self.assertEqual(hits[0].title, 'Send <mark>invoices</mark>')
+        self.assertIn('&lt;b&gt;monthly&lt;/b&gt;', hits[0].snippet)
+
+    def test_index_follows_edits_and_deletes(self):
+        self.report.title = 'Annual budget'
+        self.report.description = ''
+        self.report.save()
+        self.invoice.delete()
+        self.assertEqual(search.search_tasks('invoice'), ([], False))
+        self.assertEqual([hit.task for hit in search.search_tasks('budg')[0]], [self.report])
+
+    def test_paging_and_view(self):
+        hits, has_next = search.search_tasks('invoice', page=1, per_page=1)
+        self.assertEqual((len(hits), has_next), (1, True))
+        response = self.client.get(reverse('search_tasks'), {'q': 'quarterly'})
+        self.assertContains(response, '<mark>Quarterly</mark> report', html=True)
+        self.assertNotContains(response, 'Water plants')
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {search.FTS_TABLE}")
+        call_command('rebuild_search_index', batch_size=2, stdout=io.StringIO())
+        self.assertEqual(len(search.search_tasks('invoice')[0]), 2)
+
+
+class RetryOnLockedTests(TransactionTestCase):
+    def locked_view(self, failures):
+        calls = []
+
+        @db.retry_on_locked
+        def view(request):
+            calls.append(connection.in_atomic_block)
+            if len(calls) <= failures:
+                raise OperationalError('database is locked')
+            return HttpResponse('ok')
+        return view, calls
+
+    def test_retries_writes_in_a_transaction(self):
+        view, calls = self.locked_view(failures=2)
+        with self.assertLogs('dashboard.db', 'WARNING') as logs:
+            self.assertEqual(view(RequestFactory().post('/')).content, b'ok')
+        self.assertEqual(calls, [True, True, True])
+        self.assertEqual(len(logs.records), 2)
+
+    def test_gives_up_and_skips_safe_requests(self):
+        view, calls = self.locked_view(failures=db.LOCK_RETRIES)
+        with self.assertRaises(OperationalError), self.assertLogs('dashboard.db', 'WARNING'):
+            view(RequestFactory().post('/'))
+        view, calls = self.locked_view(failures=1)
+        with self.assertRaises(OperationalError):
+            view(RequestFactory().get('/'))
+        self.assertEqual(calls, [False])
+
+
+@override_settings(DASHBOARD_QUERY_PROFILER=True, DASHBOARD_QUERY_PROFILER_N_PLUS_ONE=3)
+class QueryProfilerTests(TestCase):
+    def setUp(self):
+        profiling.clear_profiles()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_headers_and_report(self):
+        response = self.client.get(reverse('all_tasks'))
+        self.assertGreater(int(response['X-DB-Query-Count']), 0)
+        self.assertIn('X-DB-Time-Ms', response)
+        self.assertNotIn('X-DB-N-Plus-One', response)
+        report = self.client.get(reverse('query_report'))
+        self.assertContains(report, reverse('all_tasks'))
+
+    def test_flags_repeated_queries(self):
+        recorder = profiling.QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for pk in range(4):
+                Task.objects.filter(pk=pk).first()
+        profile = recorder.summary(RequestFactory().get('/x/'), HttpResponse(), threshold=3)
+        self.assertEqual((profile['count'], profile['duplicates']), (4, 3))
+        self.assertEqual(len(profile['n_plus_one']), 1)
+        self.assertEqual(profile['n_plus_one'][0][1], 4)
+
+    def test_fingerprint_ignores_parameters(self):
+        self.assertEqual(
+            profiling.fingerprint("SELECT 1 FROM t WHERE id IN (%s, %s) LIMIT 21"),
+            profiling.fingerprint("SELECT 1 FROM t WHERE id IN (%s) LIMIT 5"),
+        )
+
+
+class UserProfileContextTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.profile = Profile.objects.create(user=self.user, name='Admin', phone='1', role='employee', email='a@example.com')
+        self.client.force_login(self.user)
+
+    def profile_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('all_tasks'))
+        return response, [q for q in ctx.captured_queries if 'dashboard_profile' in q['sql']]
+
+    def test_profile_loaded_once_and_invalidated_on_save(self):
+        response, queries = self.profile_queries()
+        self.assertContains(response, reverse('employee_dashboard'))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.profile_queries()[1], [])
+
+        self.profile.role = 'manager'
+        self.profile.save()
+        response, queries = self.profile_queries()
+        self.assertNotContains(response, reverse('employee_dashboard'))
+        self.assertEqual(len(queries), 1)
+
+    def test_missing_profile_is_cached(self):
+        self.profile.delete()
+        self.assertEqual(profiles.profile_summary(self.user.pk), {})
+        with self.assertNumQueries(0):
+            profiles.profile_summary(self.user.pk)
+
+
+def png_bytes(color='red', size=(400, 300)):
+    from PIL import Image
+    out = io.BytesIO()
+    Image.new('RGB', size, color).save(out, 'PNG')
+    return out.getvalue()
+
+
+@override_settings(DASHBOARD_BACKGROUND_INLINE=True)
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def create_employee(self, name, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            employee = Employee.objects.create(name=name, profile_picture=SimpleUploadedFile(f'{name}.png', data))
+        employee.refresh_from_db()
+        return employee
+
+    def test_upload_renders_shared_content_addressed_thumbnail(self):
+        first = self.create_employee('a', png_bytes())
+        second = self.create_employee('b', png_bytes())
+        self.assertRegex(first.profile_thumbnail, thumbnails.THUMBNAIL_NAME)
+        self.assertEqual(first.profile_thumbnail, second.profile_thumbnail)
+        self.assertEqual(first.avatar_url, reverse('thumbnail', args=[first.profile_thumbnail]))
+
+        response = self.client.get(first.avatar_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        from PIL import Image
+        self.assertEqual(Image.open(io.BytesIO(b''.join(response.streaming_content))).size, thumbnails.THUMBNAIL_SIZE)
+
+    def test_unchanged_picture_is_not_rendered_again(self):
+        employee = self.create_employee('a', png_bytes())
+        with mock.patch.object(thumbnails, 'schedule_thumbnail') as schedule:
+            employee.name = 'renamed'
+            employee.save()
+        schedule.assert_not_called()
+
+    def test_rejects_other_paths(self):
+        self.assertEqual(self.client.get(reverse('thumbnail', args=['../db.sqlite3'])).status_code, 404)
+
+
+@override_settings(DASHBOARD_BACKGROUND_INLINE=True)
+class DedupMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def add_employee(self, email):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('add_employee'), {
+                'name': 'Asha', 'email': email, 'phone': '1', 'role': 'employee',
+                'profile_picture': SimpleUploadedFile('me.png', png_bytes(), content_type='image/png'),
+            })
+        return Employee.objects.get(email=email)
+
+    def test_one_blob_per_content_with_refcounted_deletes(self):
+        employee = self.add_employee('asha@example.com')
+        other = self.add_employee('bala@example.com')
+        name = employee.profile_picture.name
+        self.assertEqual(Profile.objects.get(user=employee.user).profile_picture.name, name)
+        self.assertEqual(other.profile_picture.name, name)
+        self.assertEqual(media.stored_blobs(), {name})
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('delete_employee', args=[employee.pk]))
+            self.client.get(reverse('delete_user', args=[other.user_id]))
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 1)
+        self.assertEqual(media.stored_blobs(), {name})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('delete_user', args=[employee.user_id]))
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertEqual(media.stored_blobs(), set())
+
+    def test_collect_garbage_repairs_counts(self):
+        employee = self.add_employee('asha@example.com')
+        name = employee.profile_picture.name
+        MediaBlob.objects.update(ref_count=7)
+        Employee.objects.filter(pk=employee.pk).update(profile_picture='')
+        self.assertEqual(media.collect_garbage(), ([name], []))
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 1)
+
+    def test_concurrent_upload_of_same_content_reuses_blob(self):
+        storage = DedupStorage(location=self.media_root)
+        first = storage.save('profile_pics/a.png', ContentFile(b'same bytes'))
+        # The other upload wrote the blob between our exists() check and the open().
+        with mock.patch.object(DedupStorage, 'exists', side_effect=[False, True]):
+            second = storage.save('profile_pics/b.png', ContentFile(b'same bytes'))
+        self.assertEqual(second, first)
+        self.assertEqual(MediaBlob.objects.get(name=first).ref_count, 2)
+
+
+class BackupRestoreTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('asha', 'asha@example.com', 'pw')
+        self.employee = Employee.objects.create(name='Asha', user=self.user)
+        self.task = Task.objects.create(title='Ship release', description='notes', assigned_by=self.user)
+        self.task.assigned_employees.add(self.employee)
+        Notification.objects.create(user=self.user, task=self.task, message='hi')
+
+    def test_round_trip_through_json_lines(self):
+        created_at = (timezone.now() - timedelta(days=400)).replace(microsecond=0)
+        Task.objects.filter(pk=self.task.pk).update(created_at=created_at)
+        out = io.StringIO()
+        counts = backups.write_backup(out, chunk_size=1)
+        self.assertEqual(counts['dashboard.Task'], 1)
+        self.assertNotIn('dashboard.TaskStats', counts)
+
+        User.objects.all().delete()
+        Task.objects.all().delete()
+        out.seek(0)
+        result = backups.restore_records(iter_json_records(out), batch_size=1)
+        self.assertEqual(result.counts['auth.User'], 1)
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertEqual(list(task.assigned_employees.all()), [self.employee])
+        self.assertEqual(task.created_at, created_at)
+        self.assertEqual(Notification.objects.get().user, self.user)
+        self.assertEqual(stats.find_drift(), {})
+        self.assertEqual([hit.task for hit in search.search_tasks('ship')[0]], [task])
+
+    def test_reads_truncated_dumpdata_array(self):
+        legacy = json.dumps([
+            {'model': 'contenttypes.contenttype', 'pk': 99, 'fields': {'app_label': 'x', 'model': 'y'}},
+            {'model': 'dashboard.task', 'pk': 50, 'fields': {'title': 'Old', 'description': '', 'obsolete': 1}},
+            {'model': 'dashboard.task', 'pk': 51, 'fields': {'title': 'Cut off', 'description': ''}},
+        ])[:-40]
+        with self.assertRaises(ValueError):
+            backups.restore_records(iter_json_records(io.StringIO(legacy)))
+        self.assertFalse(Task.objects.filter(pk=50).exists())
+
+        result = backups.restore_records(iter_json_records(io.StringIO(legacy)), allow_truncated=True)
+        self.assertTrue(result.truncated)
+        self.assertEqual((result.counts, result.skipped), ({'dashboard.Task': 1}, 1))
+        self.assertEqual(Task.objects.get(pk=50).title, 'Old')
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.task = Task.objects.create(title='First task', description='')
+
+    def task_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        return response, [q for q in ctx.captured_queries if 'FROM "dashboard_task"' in q['sql']]
+
+    def test_all_tasks_table_cached_until_tasks_change(self):
+        response, queries = self.task_queries(reverse('all_tasks'))
+        self.assertContains(response, 'First task')
+        self.assertTrue(queries)
+        response, queries = self.task_queries(reverse('all_tasks'))
+        self.assertContains(response, 'First task')
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertEqual(queries, [])
+
+        self.task.title = 'Renamed task'
+        self.task.save()
+        self.assertContains(self.client.get(reverse('all_tasks')), 'Renamed task')
+
+        employee = Employee.objects.create(name='Zed Assignee')
+        self.task.assigned_employees.add(employee)
+        self.assertContains(self.client.get(reverse('all_tasks')), 'Zed Assignee')
+
+    def test_cached_dashboard_runs_no_counter_queries(self):
+        self.client.get(reverse('dashboard'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual([q for q in ctx.captured_queries if 'dashboard_task' in q['sql']], [])
+        self.assertContains(response, 'All Tasks')
+
+    def test_bulk_and_employee_changes_invalidate(self):
+        self.client.get(reverse('dashboard'))
+        self.client.get(reverse('employee_list'))
+        bulk.apply_bulk_task_changes([self.task.pk], status='completed')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['counters']['completed_count'], 1)
+
+        Employee.objects.create(name='Newcomer')
+        self.assertContains(self.client.get(reverse('employee_list')), 'Newcomer')
+
+    def test_versions_are_stable_until_bumped(self):
+        version = fragments.versions(fragments.TASKS, fragments.EMPLOYEES)
+        self.assertEqual(fragments.versions(fragments.TASKS, fragments.EMPLOYEES), version)
+        fragments.bump(fragments.EMPLOYEES)
+        self.assertNotEqual(fragments.versions(fragments.TASKS, fragments.EMPLOYEES), version)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.employee = Employee.objects.create(name='Asha', user=self.user)
+        self.task = Task.objects.create(title='Async task', description='', due_date=timezone.localdate())
+        self.task.assigned_employees.add(self.employee)
+
+    async def test_async_pages_render_the_same_data(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('async_dashboard'))
+        self.assertEqual(response.context['counters']['due_today_count'], 1)
+        self.assertContains(await self.async_client.get(reverse('async_all_tasks')), 'Async task')
+        self.assertContains(await self.async_client.get(reverse('async_employee_list')), 'Asha')
+        self.assertContains(await self.async_client.get(reverse('async_employee_dashboard')), 'Async task')
+
+    async def test_cached_fragment_skips_the_fetch(self):
+        await self.async_client.aforce_login(self.user)
+        await self.async_client.get(reverse('async_all_tasks'))
+        response = await self.async_client.get(reverse('async_all_tasks'))
+        self.assertContains(response, 'Async task')
+        # The lazy fallback was never evaluated.
+        self.assertIs(response.context['page']._wrapped, empty)
+
+
+class DemoDataTests(TestCase):
+    def test_generated_data_is_consistent(self):
+        result = demo.generate(users=12, tasks=40, max_assignees=3, notifications_per_user=2, seed=7, batch_size=5)
+        self.assertEqual((result.users, result.tasks, result.notifications), (12, 40, 24))
+        self.assertEqual(Employee.objects.filter(user__username__startswith='demo.').count(), 12)
+        self.assertEqual(Profile.objects.count(), 12)
+        self.assertEqual(Task.assigned_employees.through.objects.count(), result.assignments)
+        self.assertEqual(stats.find_drift(), {})
+        if search.fts_enabled():
+            self.assertTrue(search.search_tasks(Task.objects.first().title.split()[0])[0])
+
+    def test_bench_urls_reports_every_page(self):
+        demo.generate(users=3, tasks=5, seed=1)
+        out = io.StringIO()
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            call_command('bench_urls', repeat=2, warmup=0, only=['dashboard', 'all_tasks', 'edit_task', 'export_tasks'],
+                         stdout=out, stderr=io.StringIO())
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report['results']), {'dashboard', 'all_tasks', 'edit_task', 'export_tasks'})
+        # Session and user lookups, plus the export query that runs while the body streams.
+        self.assertEqual(report['results']['export_tasks']['queries'], 3)
+        self.assertEqual(report['results']['all_tasks']['status'], 200)
+        self.assertGreater(report['results']['all_tasks']['queries'], 0)
+        self.assertFalse(User.objects.filter(username__startswith='bench-').exists())
+
+    def test_bench_urls_keeps_the_thumbnail_directory(self):
+        name = 'ab/' + 'a' * 64 + '.webp'
+        Employee.objects.create(name='Asha', profile_thumbnail=name)
+        self.assertEqual(bench_urls.url_arguments()['thumbnail'], {'name': name})
+
+
+class CsvExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.user)
+        self.asha = Employee.objects.create(name='Asha', email='asha@example.com')
+        self.ravi = Employee.objects.create(name='Ravi', email='ravi@example.com')
+        self.shared = Task.objects.create(title='Shared', description='=HYPERLINK("x")', status=Task.STATUS_PENDING)
+        self.shared.assigned_employees.add(self.asha, self.ravi)
+        Task.objects.create(title='Done', description='', status=Task.STATUS_COMPLETED)
+
+    def read(self, response):
+        body = b''.join(response.streaming_content)
+        self.assertTrue(body.startswith(codecs.BOM_UTF8))
+        return list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+
+    def test_task_export_flattens_assignees_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.read(self.client.get(reverse('export_tasks')))
+        self.assertEqual(rows[0], exports.TASK_COLUMNS)
+        shared = rows[1]
+        self.assertEqual(sorted(shared[6].split(exports.ASSIGNEE_SEPARATOR)), ['Asha', 'Ravi'])
+        self.assertEqual(shared[2], '\'=HYPERLINK("x")')
+        self.assertEqual(rows[2][3], 'Completed')
+        export_queries = [q for q in queries.captured_queries if 'dashboard_task' in q['sql']]
+        self.assertEqual(len(export_queries), 1)
+
+    def test_filtered_export_keeps_every_assignee(self):
+        response = self.client.get(reverse('export_tasks'), {'assignee': self.asha.pk})
+        self.assertIn('attachment; filename="tasks-', response['Content-Disposition'])
+        rows = self.read(response)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(sorted(rows[1][6].split(exports.ASSIGNEE_SEPARATOR)), ['Asha', 'Ravi'])
+
+    def test_employee_export_counts_tasks(self):
+        rows = self.read(self.client.get(reverse('export_employees')))
+        self.assertEqual([row[1] for row in rows[1:]], ['Asha', 'Ravi'])
+        self.assertEqual(rows[1][-1], '1')
+
+
+class ManageUsersTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.admin)
+        for i in range(60):
+            user = User.objects.create_user(f'user{i:02d}', f'user{i:02d}@example.com')
+            Profile.objects.create(user=user, name=f'User {i}', phone='1', role='manager' if i % 2 else 'employee',
+                                   email=user.email)
+        self.boss = User.objects.get(username='user07')
+        Employee.objects.create(name='Report', manager=self.boss)
+        Task.objects.bulk_create([Task(title=f'T{i}', description='', assigned_by=self.boss) for i in range(3)])
+
+    def test_page_cost_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('manage_users'))
+        page = response.context['page']
+        self.assertEqual(len(page.object_list), directory.USERS_PER_PAGE)
+        self.assertEqual(page.paginator.count, 61)
+        listing = [q for q in queries.captured_queries if 'dashboard_employee' in q['sql']]
+        self.assertEqual(len(listing), 1)
+        self.assertLess(len(queries), 10)
+        boss = next(user for user in page if user.pk == self.boss.pk)
+        self.assertEqual((boss.role, boss.employee_count, boss.assigned_task_count), ('manager', 1, 3))
+
+    def test_sort_and_search(self):
+        response = self.client.get(reverse('manage_users'), {'sort': '-tasks'})
+        self.assertEqual(response.context['page'][0], self.boss)
+        response = self.client.get(reverse('manage_users'), {'q': 'user1', 'sort': '-username'})
+        self.assertEqual([u.username for u in response.context['page']][:2], ['user19', 'user18'])
+        response = self.client.get(reverse('manage_users'), {'sort': 'password'})
+        self.assertEqual(response.context['page'][0].username, 'admin')
+
+
+class OrgHierarchyTests(TestCase):
+    def setUp(self):
+        self.users = {name: User.objects.create_user(name) for name in ['ceo', 'vp', 'lead', 'dev', 'ops']}
+        self.ceo = Employee.objects.create(name='Ceo', user=self.users['ceo'])
+        self.vp = Employee.objects.create(name='Vp', user=self.users['vp'], manager=self.users['ceo'])
+        self.lead = Employee.objects.create(name='Lead', user=self.users['lead'], manager=self.users['vp'])
+        self.dev = Employee.objects.create(name='Dev', user=self.users['dev'], manager=self.users['lead'])
+        self.ops = Employee.objects.create(name='Ops', user=self.users['ops'], manager=self.users['ceo'])
+
+    def paths(self):
+        return dict(Employee.objects.values_list('name', 'org_path'))
+
+    def test_paths_follow_managers(self):
+        paths = self.paths()
+        self.assertEqual(paths['Dev'], f'/{self.ceo.pk}/{self.vp.pk}/{self.lead.pk}/{self.dev.pk}/')
+        team = Employee.objects.filter(hierarchy.in_subtree(paths['Vp'])).values_list('name', flat=True)
+        self.assertEqual(sorted(team), ['Dev', 'Lead', 'Vp'])
+
+    def test_moving_a_manager_rewrites_the_subtree_in_one_update(self):
+        self.lead.manager = self.users['ops']
+        with CaptureQueriesContext(connection) as queries:
+            self.lead.save()
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE "dashboard_employee" SET "org_path"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.paths()['Dev'], f'/{self.ceo.pk}/{self.ops.pk}/{self.lead.pk}/{self.dev.pk}/')
+        self.assertEqual(hierarchy.rebuild(), 0)
+
+    def test_cycles_are_refused_and_deletes_re_root_reports(self):
+        self.vp.manager = self.users['dev']
+        with self.assertRaises(ValueError):
+            self.vp.save()
+        self.assertFalse(EmployeeForm({'name': 'Vp', 'manager': self.users['dev'].pk}, instance=self.vp).is_valid())
+        self.lead.delete()
+        self.assertEqual(self.paths()['Dev'], f'/{self.dev.pk}/')
+        self.assertEqual(hierarchy.rebuild(), 0)
+
+    def test_manager_created_after_reports_adopts_them(self):
+        boss = User.objects.create_user('boss')
+        report = Employee.objects.create(name='Report', user=User.objects.create_user('report'), manager=boss)
+        self.assertEqual(self.paths()['Report'], f'/{report.pk}/')
+        head = Employee.objects.create(name='Boss', user=boss)
+        self.assertEqual(self.paths()['Report'], f'/{head.pk}/{report.pk}/')
+        self.assertEqual(hierarchy.rebuild(), 0)
+
+    def test_rebuild_repairs_bulk_writes(self):
+        Employee.objects.update(org_path='')
+        self.assertEqual(hierarchy.rebuild(), 5)
+        self.assertEqual(self.paths()['Lead'], f'/{self.ceo.pk}/{self.vp.pk}/{self.lead.pk}/')
+
+    def test_team_dashboard_counts_the_subtree(self):
+        today = timezone.localdate()
+        late = Task.objects.create(title='Late', description='', due_date=today - timedelta(days=1))
+        late.assigned_employees.add(self.dev, self.lead)
+        Task.objects.create(title='Ops only', description='').assigned_employees.add(self.ops)
+        self.client.force_login(self.users['vp'])
+        response = self.client.get(reverse('team_dashboard'))
+        self.assertEqual(response.context['summary']['total'], 1)
+        self.assertEqual(response.context['summary']['overdue'], 1)
+        self.assertEqual(response.context['headcount'], 3)
+        report = response.context['reports'].get()
+        self.assertEqual((report.name, report.headcount, report.open_task_count), ('Lead', 2, 1))
+        # Outside their own subtree a manager is sent back to their team.
+        self.assertRedirects(self.client.get(reverse('team_dashboard', args=[self.ops.pk])), reverse('team_dashboard'))
+
+    def test_direct_reports_and_read_only_team_page(self):
+        self.assertEqual(sorted(hierarchy.direct_reports(self.ceo)), sorted([self.vp.pk, self.ops.pk]))
+        Employee.objects.filter(pk=self.ops.pk).update(org_path='')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.assertRedirects(self.client.get(reverse('team_dashboard', args=[self.ops.pk])), reverse('dashboard'))
+        self.assertEqual(self.paths()['Ops'], '')
+
+
+class TaskActivityTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.user)
+        self.task = Task.objects.create(title='Ship it', description='')
+
+    def codes(self):
+        return list(self.task.events.order_by('timestamp', 'id').values_list('from_status', 'to_status'))
+
+    def test_status_changes_are_logged_with_durations(self):
+        created = self.task.created_at
+        self.task.status = Task.STATUS_IN_PROGRESS
+        activity.acting_as(self.task, self.user).save()
+        self.task.title = 'Ship it now'
+        self.task.save()
+        self.task.status = Task.STATUS_COMPLETED
+        with mock.patch('django.utils.timezone.now', return_value=created + timedelta(hours=5)):
+            self.task.save()
+        self.assertEqual(self.codes(), [(None, 1), (1, 2), (2, 3)])
+        done = self.task.events.get(to_status=TaskEvent.COMPLETED)
+        self.assertEqual(done.age, 5 * 3600)
+        self.assertEqual(self.task.events.get(to_status=TaskEvent.IN_PROGRESS).actor, self.user)
+        with self.assertRaises(ValueError):
+            done.save()
+
+    def test_edit_view_and_bulk_update_log_in_the_same_transaction(self):
+        data = {'title': 'Ship it', 'description': 'x', 'status': Task.STATUS_IN_PROGRESS}
+        self.client.post(reverse('edit_task', args=[self.task.pk]), data)
+        bulk.apply_bulk_task_changes([self.task.pk], status=Task.STATUS_COMPLETED, actor=self.user)
+        self.assertEqual(self.codes(), [(None, 1), (1, 2), (2, 3)])
+        self.assertContains(self.client.get(reverse('edit_task', args=[self.task.pk])), 'In Progress → Completed')
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            bulk.apply_bulk_task_changes([self.task.pk], status=Task.STATUS_PENDING)
+            raise RuntimeError
+        self.assertEqual(self.task.events.count(), 3)
+
+    def test_report_aggregates_per_period(self):
+        now = timezone.now()
+        TaskEvent.objects.bulk_create([
+            TaskEvent(task=self.task, from_status=TaskEvent.IN_PROGRESS, to_status=TaskEvent.COMPLETED,
+                      timestamp=now - timedelta(days=1), duration=2 * 3600, age=10 * 3600),
+            TaskEvent(task=self.task, from_status=TaskEvent.IN_PROGRESS, to_status=TaskEvent.COMPLETED,
+                      timestamp=now - timedelta(days=1), duration=4 * 3600, age=20 * 3600),
+        ])
+        with self.assertNumQueries(2):
+            rows = activity.activity_report('day', days=7, now=now)
+        latest = next(row for row in rows if row['completed'])
+        self.assertEqual(latest['completed'], 2)
+        self.assertAlmostEqual(latest['avg_cycle_hours'], 15)
+        self.assertAlmostEqual(latest['status_hours']['in_progress'], 3)
+        self.assertContains(self.client.get(reverse('activity_report'), {'period': 'day'}), '15.0')
@@ -0,0 +1,80 @@
+import hashlib
+import io
+import re
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from . import background, fragments, profiles
+
+
+THUMBNAIL_SIZE = (128, 128)
+THUMBNAIL_DIR = 'thumbs'
+THUMBNAIL_NAME = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{64}\.(webp|jpg)$')
+READ_CHUNK = 1 << 16
+
+
+# ---------------- Thumbnail Rendering ----------------
+# Thumbnails are named after the SHA-256 of the original plus the target size,
+# so identical uploads share one file and a stored thumbnail never changes:
+# it can be served with a year-long immutable Cache-Control header.
+
+def thumbnail_format():
+    return ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+
+
+def content_digest(field_file):
+    digest = hashlib.sha256(f'{THUMBNAIL_SIZE[0]}x{THUMBNAIL_SIZE[1]}:'.encode())
+    with field_file.open('rb') as fp:
+        for chunk in iter(lambda: fp.read(READ_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def render_thumbnail(field_file, image_format):
+    with field_file.open('rb') as fp:
+        image = Image.open(fp)
+        image.draft('RGB', THUMBNAIL_SIZE)  # let JPEG decode at a reduced scale
+        image = ImageOps.exif_transpose(image)
+        image = ImageOps.fit(image.convert('RGB'), THUMBNAIL_SIZE, Image.LANCZOS)
+    out = io.BytesIO()
+    image.save(out, image_format, quality=82)
+    return out.getvalue()
+
+
+def make_thumbnail(field_file):
+    """Return the storage name of the thumbnail for ``field_file``, rendering it if needed."""
+    image_format, extension = thumbnail_format()
+    digest = content_digest(field_file)
+    relative = f'{digest[:2]}/{digest}.{extension}'
+    name = f'{THUMBNAIL_DIR}/{relative}'
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(render_thumbnail(field_file, image_format)))
+    return relative
+
+
+# ---------------- Background Jobs ----------------
+def schedule_thumbnail(instance):
+    """Render the thumbnail for ``instance.profile_picture`` after the save commits."""
+    background.submit_on_commit(update_thumbnail, instance._meta.label, instance.pk)
+
+
+def update_thumbnail(model_label, pk):
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).only('profile_picture', 'user_id').first()
+    if instance is None:
+        return None
+    thumbnail = ''
+    if instance.profile_picture:
+        try:
+            thumbnail = make_thumbnail(instance.profile_picture)
+        except (UnidentifiedImageError, OSError):
+            thumbnail = ''
+    # update() so the post_save hooks do not schedule another render.
+    model.objects.filter(pk=pk, profile_picture=instance.profile_picture.name).update(profile_thumbnail=thumbnail)
+    if instance.user_id is not None:
+        profiles.invalidate_profile(instance.user_id)
+    fragments.bump(fragments.EMPLOYEES)
+    return thumbnail
@@ -1,26 +1,39 @@
+from django.conf import settings
 from django.urls import path  # type: ignore
-from . import views
+from . import async_views, views
+
+
+# Read-heavy pages: sync views under WSGI, async ones when DASHBOARD_ASYNC_VIEWS is set.
+read_views = async_views if getattr(settings, 'DASHBOARD_ASYNC_VIEWS', False) else views
 
 
 urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('employee-login/', views.employee_login, name='employee_login'),
-    path('employee-dashboard/', views.employee_dashboard, name='employee_dashboard'),
+    path('employee-dashboard/', read_views.employee_dashboard, name='employee_dashboard'),
+    path('team/', views.team_dashboard, name='team_dashboard'),
+    path('team/<int:pk>/', views.team_dashboard, name='team_dashboard'),
     path('employee-logout/', views.employee_logout, name='employee_logout'),
 
     path('logout/', views.logout_view, name='logout'),
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', read_views.dashboard, name='dashboard'),
 
     path('create-task/', views.create_task, name='create_task'),
-    path('tasks/', views.all_tasks, name='all_tasks'),
-    path('all-tasks/', views.all_tasks, name='all_tasks'),
+    path('tasks/', read_views.all_tasks, name='all_tasks'),
+    path('all-tasks/', read_views.all_tasks, name='all_tasks'),
+    path('tasks/export/', views.export_tasks, name='export_tasks'),
+    path('tasks/search/', views.search_tasks, name='search_tasks'),
+    path('tasks/bulk/', views.bulk_update_tasks, name='bulk_update_tasks'),
     path('tasks/<int:pk>/edit/', views.edit_task, name='edit_task'),
     path('tasks/<int:pk>/delete/', views.delete_task, name='delete_task'),
 
-    path('employees/', views.employee_list, name='employee_list'),
+    path('employees/', read_views.employee_list, name='employee_list'),
     path('employees/add/', views.add_or_edit_employee, name='add_employee'),
     path('employees/edit/<int:pk>/', views.add_or_edit_employee, name='edit_employee'),
     path('employees/delete/<int:pk>/', views.delete_employee, name='delete_employee'),
+    path('employees/import/', views.import_employees, name='import_employees'),
+    path('employees/export/', views.export_employees, name='export_employees'),
+    path('employees/autocomplete/', views.employee_autocomplete, name='employee_autocomplete'),
 
     path('add-employee/', views.add_employee, name='add_employee'),  # Optional if duplicate
     path('manage-users/', views.manage_users, name='manage_users'),
@@ -29,10 +42,22 @@ urlpatterns = [
     path('delete-user/<int:user_id>/', views.delete_user, name='delete_user'),
 
     # ✅ Updated notification route name for template compatibility
-    
+    path('notifications/', views.notification_list, name='notifications'),
+    path('notifications/read/', views.mark_notifications_read, name='mark_notifications_read'),
+    path('alerted-tasks/', views.alerted_tasks, name='alerted_tasks'),
+
+    # Async read views, always reachable for side-by-side comparison (bench_asgi).
+    path('async/dashboard/', async_views.dashboard, name='async_dashboard'),
+    path('async/tasks/', async_views.all_tasks, name='async_all_tasks'),
+    path('async/employees/', async_views.employee_list, name='async_employee_list'),
+    path('async/employee-dashboard/', async_views.employee_dashboard, name='async_employee_dashboard'),
+
+    path('reports/activity/', views.activity_report, name='activity_report'),
+    path('profiler/queries/', views.query_report, name='query_report'),
+    path('thumbs/<path:name>', views.thumbnail, name='thumbnail'),
 
     # Homepage as dashboard
-    path('', views.dashboard, name='dashboard'),
+    path('', read_views.dashboard, name='dashboard'),
 # type: ignore
 
 ]
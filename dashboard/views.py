@@ -1,14 +1,33 @@
+import json
+
+from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Prefetch
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
 from django.utils.crypto import get_random_string
-from django.core.mail import send_mail
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.http import require_POST
 from django.contrib import messages
 
-from .models import Profile, Task, Employee
-from .forms import AddEmployeeForm, TaskForm, EmployeeForm
+from .models import Profile, Task, Employee, Notification
+from .forms import AddEmployeeForm, TaskForm, EmployeeForm, TaskFilterForm, EmployeeImportForm
+from .db import retry_on_locked
+from .pagination import paginate
+from .streams import text_stream
+from . import activity, bulk, directory, exports, fragments, hierarchy, importers, notifications, outbox, profiling, search, stats, thumbnails
+
+TASKS_PER_PAGE = 50
+TASK_SEARCH_PAGE_SIZE = 20
+TASK_HISTORY_LENGTH = 20
+# Each row hashes a password in the request; bigger files go through `manage.py import_employees`.
+IMPORT_MAX_ROWS = 50
 
 
 # ------------------- 🔐 Admin Login -------------------
@@ -34,33 +53,26 @@ def logout_view(request):
 # ------------------- 📊 Admin Dashboard -------------------
 @login_required
 def dashboard(request):
-    today = timezone.now().date()
-    context = {
-        'employee_count': Employee.objects.count(),
-        'task_count': Task.objects.count(),
-        'overdue_count': Task.objects.filter(due_date__lt=today, status__in=['pending', 'in_progress']).count(),
-        'no_deadline_count': Task.objects.filter(due_date__isnull=True).count(),
-        'due_today_count': Task.objects.filter(due_date=today).count(),
-        'pending_count': Task.objects.filter(status='pending').count(),
-        'in_progress_count': Task.objects.filter(status='in_progress').count(),
-        'completed_count': Task.objects.filter(status='completed').count(),
-        
-    }
+    # Only counted when the cached counter fragment is missing.
+    context = {'counters': SimpleLazyObject(stats.read_counters), 'today': timezone.localdate()}
+    context.update(fragments.fragment_context(fragments.TASKS, fragments.EMPLOYEES))
     return render(request, 'dashboard/dashboard.html', context)
 
 
 # ------------------- ✅ Create Task -------------------
 @login_required
+@retry_on_locked
 def create_task(request):
     if request.method == "POST":
         form = TaskForm(request.POST)
         if form.is_valid():
             task = form.save(commit=False)
             task.assigned_by = request.user
-            task.save()
+            activity.acting_as(task, request.user).save()
             form.save_m2m()
+            if task.alert_all:
+                notifications.schedule_task_alert(task, created=True, actor=request.user)
 
-        
             messages.success(request, "Task created successfully!")
             return redirect('dashboard')
     else:
@@ -73,8 +85,20 @@ def create_task(request):
 def manage_users(request):
     if not request.user.is_superuser:
         return redirect('dashboard')
-    users = User.objects.all()
-    return render(request, 'dashboard/manage_users.html', {'users': users})
+    search_text = request.GET.get('q', '')
+    sort_key, descending = directory.parse_sort(request.GET.get('sort'))
+    users = directory.user_directory(search_text, request.GET.get('sort'))
+    page = Paginator(users, directory.USERS_PER_PAGE).get_page(request.GET.get('page'))
+    # Header links: clicking the active column flips its direction.
+    columns = [
+        (key, label, f'-{key}' if key == sort_key and not descending else key,
+         ('▼' if descending else '▲') if key == sort_key else '')
+        for key, label in [('username', 'Username'), ('email', 'Email'), ('role', 'Role'), ('joined', 'Joined'),
+                           ('employees', 'Reports'), ('tasks', 'Tasks Assigned')]
+    ]
+    return render(request, 'dashboard/manage_users.html', {
+        'page': page, 'columns': columns, 'query': search_text,
+    })
 
 
 @login_required
@@ -124,8 +148,31 @@ def delete_user(request, user_id):
 # ------------------- 🧑‍💼 Employee Management -------------------
 @login_required
 def employee_list(request):
-    employees = Employee.objects.all()
-    return render(request, 'dashboard/employee_list.html', {'employees': employees})
+    employees = Employee.objects.select_related('user')
+    context = {'employees': employees}
+    context.update(fragments.fragment_context(fragments.EMPLOYEES))
+    return render(request, 'dashboard/employee_list.html', context)
+
+
+AUTOCOMPLETE_PAGE_SIZE = 20
+
+
+@login_required
+def employee_autocomplete(request):
+    """Select2-style JSON results for the employee pickers."""
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    offset = (page - 1) * AUTOCOMPLETE_PAGE_SIZE
+    matches = list(search.search_employees(request.GET.get('q', ''), offset, AUTOCOMPLETE_PAGE_SIZE + 1))
+    return JsonResponse({
+        'results': [
+            {'id': employee.pk, 'text': f"{employee} ({employee.email})" if employee.email else str(employee)}
+            for employee in matches[:AUTOCOMPLETE_PAGE_SIZE]
+        ],
+        'pagination': {'more': len(matches) > AUTOCOMPLETE_PAGE_SIZE},
+    })
 
 
 @login_required
@@ -142,6 +189,7 @@ def add_or_edit_employee(request, pk=None):
 
 
 @login_required
+@retry_on_locked
 def add_employee(request):
     if not request.user.is_superuser:
         return redirect('dashboard')
@@ -159,29 +207,25 @@ def add_employee(request):
                 form.add_error('email', 'An employee with this email already exists.')
             else:
                 random_password = get_random_string(length=10)
-                user = User.objects.create_user(
-                    username=email, email=email, password=random_password, first_name=name
-                )
-                Profile.objects.create(
-                    user=user, name=name, phone=phone, role=role,
-                    profile_picture=profile_picture, email=email
-                )
-                Employee.objects.create(
-                    user=user, name=name, email=email, phone=phone,
-                    role=role, profile_picture=profile_picture
-                )
-
-                # Send email
-                try:
-                    send_mail(
+                with transaction.atomic():
+                    user = User.objects.create_user(
+                        username=email, email=email, password=random_password, first_name=name
+                    )
+                    Profile.objects.create(
+                        user=user, name=name, phone=phone, role=role,
+                        profile_picture=profile_picture, email=email
+                    )
+                    Employee.objects.create(
+                        user=user, name=name, email=email, phone=phone,
+                        role=role, profile_picture=profile_picture
+                    )
+
+                    # Queued in the same transaction; delivered by `manage.py send_queued_mail`
+                    outbox.queue_mail(
                         subject='Welcome to TaskPro',
                         message=f"Hello {name},\n\nYour account has been created.\nUsername: {email}\nPassword: {random_password}",
-                        from_email=None,
                         recipient_list=[email],
-                        fail_silently=False,
                     )
-                except Exception as e:
-                    print("Email sending failed:", e)
 
                 return redirect('employee_list')
     else:
@@ -189,6 +233,28 @@ def add_employee(request):
     return render(request, 'dashboard/add_employee.html', {'form': form})
 
 
+@login_required
+def import_employees(request):
+    if not request.user.is_superuser:
+        return redirect('dashboard')
+
+    result = None
+    if request.method == 'POST':
+        form = EmployeeImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            records = importers.read_records(text_stream(upload.file), importers.guess_format(upload.name))
+            try:
+                result = importers.import_employees(importers.limit_rows(records, IMPORT_MAX_ROWS))
+            except ValueError as e:
+                form.add_error('file', str(e))
+            else:
+                messages.success(request, f'Imported {result.created} employee(s).')
+    else:
+        form = EmployeeImportForm()
+    return render(request, 'dashboard/import_employees.html', {'form': form, 'result': result})
+
+
 @login_required
 def delete_employee(request, pk):
     employee = get_object_or_404(Employee, pk=pk)
@@ -199,23 +265,117 @@ def delete_employee(request, pk):
 # ------------------- 📃 All Tasks -------------------
 @login_required
 def all_tasks(request):
-    tasks = Task.objects.prefetch_related('assigned_employees').order_by('-created_at')
-    return render(request, 'dashboard/all_tasks.html', {'tasks': tasks})
+    filter_form = TaskFilterForm(request.GET or None)
+    tasks = filter_form.filter_queryset(Task.objects.all()).prefetch_related(
+        Prefetch('assigned_employees', queryset=Employee.objects.only('id', 'name'))
+    )
+    # Lazy, so a cached table fragment costs no task queries.
+    page = SimpleLazyObject(lambda: paginate(tasks, request.GET.get('cursor'), per_page=TASKS_PER_PAGE))
+    context = {'page': page, 'filter_form': filter_form}
+    context.update(fragments.fragment_context(fragments.TASKS))
+    return render(request, 'dashboard/all_tasks.html', context)
+
+
+# ------------------- 📤 CSV Exports -------------------
+def csv_download(chunks, basename):
+    response = StreamingHttpResponse(chunks, content_type='text/csv; charset=utf-8')
+    filename = f"{basename}-{timezone.localdate():%Y%m%d}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@login_required
+def export_tasks(request):
+    """Stream the tasks matching the All Tasks filters as CSV."""
+    filter_form = TaskFilterForm(request.GET or None)
+    return csv_download(exports.export_tasks(filter_form.filter_queryset(Task.objects.all())), 'tasks')
+
+
+@login_required
+def export_employees(request):
+    return csv_download(exports.export_employees(), 'employees')
+
+
+# ------------------- 🔍 Task Search -------------------
+@login_required
+def search_tasks(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page_number = 1
+    hits, has_next = search.search_tasks(query, page_number, TASK_SEARCH_PAGE_SIZE) if query else ([], False)
+    return render(request, 'dashboard/search_tasks.html', {
+        'query': query,
+        'hits': hits,
+        'page_number': page_number,
+        'has_previous': page_number > 1,
+        'has_next': has_next,
+    })
+
+
+# ------------------- 🗂️ Bulk Task Update -------------------
+def _id_list(values):
+    if not isinstance(values, list):
+        raise TypeError('Expected a list of ids.')  # a string would be read one digit at a time
+    return [int(value) for value in values if str(value).strip()]
+
+
+@login_required
+@require_POST
+def bulk_update_tasks(request):
+    """
+    Apply one status change and/or assignee change to many tasks.
+
+    Accepts JSON (``{"task_ids": [...], "status": ..., "assign": [...], "unassign": [...]}``)
+    or the equivalent form fields posted from the All Tasks page.
+    """
+    if request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body)
+            data = {key: payload.get(key) or [] for key in ('task_ids', 'assign', 'unassign')}
+            data['status'] = payload.get('status') or None
+        except (ValueError, AttributeError):
+            return JsonResponse({'error': 'Request body must be a JSON object.'}, status=400)
+    else:
+        data = {key: request.POST.getlist(key) for key in ('task_ids', 'assign', 'unassign')}
+        data['status'] = request.POST.get('status') or None
+
+    try:
+        task_ids, assign, unassign = (_id_list(data[key]) for key in ('task_ids', 'assign', 'unassign'))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'Task and employee ids must be lists of integers.'}, status=400)
+    if data['status'] and (not isinstance(data['status'], str) or data['status'] not in dict(Task.STATUS_CHOICES)):
+        return JsonResponse({'error': f"Unknown status '{data['status']}'."}, status=400)
+    if len(task_ids) > bulk.MAX_BULK_TASKS:
+        return JsonResponse({'error': f'At most {bulk.MAX_BULK_TASKS} tasks per request.'}, status=400)
+
+    result = bulk.apply_bulk_task_changes(task_ids, data['status'], assign, unassign, actor=request.user)
+    if request.content_type == 'application/json':
+        return JsonResponse(result)
+    messages.success(request, f"Updated {result['tasks']} task(s).")
+    return redirect('all_tasks')
 
 
 # ------------------- ✏️ Edit Task -------------------
 @login_required
+@retry_on_locked
 def edit_task(request, pk):
     task = get_object_or_404(Task, pk=pk)
     if request.method == 'POST':
-        form = TaskForm(request.POST, instance=task)
+        form = TaskForm(request.POST, instance=activity.acting_as(task, request.user))
         if form.is_valid():
-            form.save()
+            task = form.save()
+            if task.alert_all:
+                notifications.schedule_task_alert(task, created=False, actor=request.user)
             messages.success(request, 'Task updated successfully.')
             return redirect('all_tasks')
     else:
         form = TaskForm(instance=task)
-    return render(request, 'dashboard/edit_task.html', {'form': form, 'task': task})
+    events = task.events.select_related('actor').only(
+        'from_status', 'to_status', 'timestamp', 'duration', 'actor__username'
+    ).order_by('-timestamp')[:TASK_HISTORY_LENGTH]
+    return render(request, 'dashboard/edit_task.html', {'form': form, 'task': task, 'events': events})
 
 
 # ------------------- ❌ Delete Task -------------------
@@ -232,14 +392,45 @@ def delete_task(request, pk):
 
 
 
+# ------------------- 🔔 Notifications -------------------
+NOTIFICATIONS_PER_PAGE = 50
+
+
+@login_required
+def notification_list(request):
+    items = Notification.objects.filter(user=request.user).order_by('-timestamp')[:NOTIFICATIONS_PER_PAGE]
+    return render(request, 'dashboard/notifications.html', {'notifications': items})
+
+
+@login_required
+def alerted_tasks(request):
+    alerts = Notification.objects.filter(user=request.user, task__isnull=False).select_related(
+        'task', 'task__assigned_by'
+    ).order_by('-timestamp')[:NOTIFICATIONS_PER_PAGE]
+    return render(request, 'dashboard/alerted_tasks.html', {'alerts': alerts})
+
+
+@login_required
+@require_POST
+def mark_notifications_read(request):
+    marked = notifications.mark_all_read(request.user.pk)
+    # Browsers list text/html explicitly; API clients sending */* get JSON.
+    if request.get_preferred_type(['application/json', 'text/html']) == 'text/html':
+        return redirect('notifications')
+    return JsonResponse({'marked': marked, 'unread': 0})
+
+
 # ------------------- 🔐 Employee Login -------------------
 def employee_login(request):
     if request.method == 'POST':
         username = request.POST.get('username')
         password = request.POST.get('password')
 
-        if username == 'employee' and password == 'employee123':
-            request.session['employee_logged_in'] = True
+        user = authenticate(username=username, password=password)
+        employee = Employee.objects.filter(user=user).only('id').first() if user else None
+        if employee:
+            login(request, user)
+            request.session['employee_id'] = employee.pk
             return redirect('employee_dashboard')
         else:
             messages.error(request, 'Invalid credentials')
@@ -247,15 +438,105 @@ def employee_login(request):
 
 
 # ------------------- 📋 Employee Dashboard -------------------
+def employee_task_feed(employee_id):
+    """Tasks assigned to one employee, with only the columns the feed template renders."""
+    return Task.objects.filter(assigned_employees=employee_id).only(
+        'id', 'title', 'description', 'status', 'due_date', 'created_at'
+    ).prefetch_related(
+        Prefetch('assigned_employees', queryset=Employee.objects.only('id', 'name'))
+    )
+
+
 def employee_dashboard(request):
-    if not request.session.get('employee_logged_in'):
+    employee_id = request.session.get('employee_id')
+    if employee_id is None and request.user.is_authenticated:
+        employee_id = Employee.objects.filter(user=request.user).values_list('id', flat=True).first()
+        request.session['employee_id'] = employee_id
+    if employee_id is None:
         return redirect('employee_login')
 
-    tasks = Task.objects.all().order_by('-created_at')
-    return render(request, 'dashboard/employee_dashboard.html', {'tasks': tasks})
+    page = paginate(employee_task_feed(employee_id), request.GET.get('cursor'), per_page=TASKS_PER_PAGE)
+    return render(request, 'dashboard/employee_dashboard.html', {'tasks': page.object_list, 'page': page})
+
+
+# ------------------- 🏢 Team Dashboard -------------------
+@login_required
+def team_dashboard(request, pk=None):
+    """Task counts and the task feed for an employee's whole org subtree."""
+    own = Employee.objects.filter(user=request.user).order_by('pk').first()
+    root = own if pk is None else get_object_or_404(Employee, pk=pk)
+    if root is None:
+        messages.info(request, 'Your login is not linked to an employee, so you have no team.')
+        return redirect('dashboard')
+    if not root.org_path:
+        messages.info(request, f'{root} is not placed in the org tree yet; run rebuild_org_paths.')
+        return redirect('dashboard')
+    # Managers see their own subtree; superusers may open anyone's.
+    if not request.user.is_superuser and not (own and own.org_path and root.org_path.startswith(own.org_path)):
+        return redirect('team_dashboard')
+
+    tasks = hierarchy.team_tasks(root).only(
+        'id', 'title', 'status', 'due_date', 'created_at'
+    ).prefetch_related(Prefetch('assigned_employees', queryset=Employee.objects.only('id', 'name')))
+    return render(request, 'dashboard/team_dashboard.html', {
+        'root': root,
+        'chain': Employee.objects.filter(pk__in=hierarchy.path_ids(root.org_path)[:-1]).order_by('org_path'),
+        'summary': hierarchy.team_summary(root, timezone.localdate()),
+        'headcount': Employee.objects.filter(hierarchy.in_subtree(root.org_path)).count(),
+        'reports': hierarchy.report_breakdown(root),
+        'page': paginate(tasks, request.GET.get('cursor'), per_page=TASKS_PER_PAGE),
+    })
 
 
 # ------------------- 🚪 Employee Logout -------------------
 def employee_logout(request):
     request.session.flush()
     return redirect('employee_login')
+
+
+# ------------------- 📈 Task Activity Report -------------------
+@login_required
+def activity_report(request):
+    """Throughput, cycle time and time in each status per day / week / month."""
+    period = request.GET.get('period', 'week')
+    try:
+        days = min(max(int(request.GET.get('days', 90)), 1), 730)
+    except ValueError:
+        days = 90
+    return render(request, 'dashboard/activity_report.html', {
+        'rows': activity.activity_report(period, days),
+        'period': period if period in activity.PERIODS else 'week',
+        'periods': activity.PERIODS,
+        'days': days,
+    })
+
+
+# ------------------- 🩺 Query Profiler Report -------------------
+@login_required
+def query_report(request):
+    if not request.user.is_superuser:
+        return redirect('dashboard')
+    if request.method == 'POST':
+        profiling.clear_profiles()
+        return redirect('query_report')
+    profiles = profiling.recent_profiles()
+    return render(request, 'dashboard/query_report.html', {
+        'profiles': profiles,
+        'paths': profiling.summarize_by_path(profiles),
+        'enabled': getattr(settings, 'DASHBOARD_QUERY_PROFILER', False),
+    })
+
+
+# ------------------- 🖼️ Thumbnails -------------------
+def thumbnail(request, name):
+    """Serve a rendered avatar; the name is content-addressed, so it can be cached for good."""
+    if not thumbnails.THUMBNAIL_NAME.match(name):
+        raise Http404
+    try:
+        fp = default_storage.open(f'{thumbnails.THUMBNAIL_DIR}/{name}', 'rb')
+    except FileNotFoundError:
+        raise Http404
+    response = FileResponse(fp, content_type='image/webp' if name.endswith('.webp') else 'image/jpeg')
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response['ETag'] = '"%s"' % name.rsplit('/', 1)[-1].split('.')[0]
+    return response
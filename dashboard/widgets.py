@@ -0,0 +1,45 @@
+from django import forms  # type: ignore
+from django.urls import reverse
+
+
+# ---------------- Autocomplete Widgets ----------------
+class AutocompleteMixin:
+    """
+    Render only the currently selected options and let Select2 fetch the rest.
+
+    The field keeps its full queryset for validation, but rendering no longer
+    iterates it, so page size and render time do not grow with the table.
+    """
+    url_name = None
+
+    def __init__(self, url_name, attrs=None):
+        self.url_name = url_name
+        super().__init__(attrs)
+
+    def get_context(self, name, value, attrs):
+        attrs = dict(attrs or {}, **{'data-autocomplete-url': reverse(self.url_name)})
+        return super().get_context(name, value, attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        # Submitted values are raw: a non-numeric one is left to the field's validation error.
+        selected = [v for v in value if str(v).isdecimal()]
+        queryset = field.queryset.filter(pk__in=selected) if selected else field.queryset.none()
+        groups = []
+        for index, obj in enumerate(queryset):
+            option = self.create_option(
+                name, field.prepare_value(obj), field.label_from_instance(obj), True, index, attrs=attrs
+            )
+            groups.append((None, [option], index))
+        return groups
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    def optgroups(self, name, value, attrs=None):
+        # Select2 needs an empty option to show the placeholder and allow clearing.
+        empty = self.create_option(name, '', '', False, 0, attrs=attrs)
+        return [(None, [empty], 0)] + super().optgroups(name, value, attrs)
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
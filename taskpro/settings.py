@@ -37,11 +37,13 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.humanize',
     'dashboard'
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'dashboard.profiling.QueryProfilerMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -52,6 +54,10 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'taskpro.urls'
 
+# Per-request query counts, DB time and N+1 detection (X-DB-* headers and /profiler/queries/).
+DASHBOARD_QUERY_PROFILER = DEBUG
+DASHBOARD_QUERY_PROFILER_N_PLUS_ONE = 5
+
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -66,12 +72,18 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'dashboard.context_processors.unread_notifications',
+                'dashboard.context_processors.user_profile',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'taskpro.wsgi.application'
+ASGI_APPLICATION = 'taskpro.asgi.application'
+
+# Serve the read-heavy pages from dashboard.async_views (for ASGI servers such as uvicorn).
+DASHBOARD_ASYNC_VIEWS = False
 
 
 # Database
@@ -81,10 +93,46 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests instead of reopening the file each time.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # WAL lets readers run alongside the single writer; NORMAL sync is durable
+            # in WAL mode except for the last transactions on power loss.
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA mmap_size=134217728;'
+                'PRAGMA cache_size=-20000;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+            # Take the write lock at BEGIN so writers queue on busy_timeout instead of
+            # failing with "database is locked" when upgrading a read transaction.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
 
+# Cache
+# Local memory works offline with no extra services. It is per process, so with
+# several worker processes point this at a shared backend instead, e.g.
+# FileBasedCache with a LOCATION every worker can reach.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'taskpro',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+# Seconds a rendered dashboard / All Tasks / Employee List fragment may be reused;
+# data changes invalidate them immediately (dashboard.fragments).
+DASHBOARD_FRAGMENT_CACHE_TIMEOUT = 600
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
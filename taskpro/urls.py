@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.shortcuts import redirect
 from dashboard import views
+from dashboard.urls import read_views
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -10,7 +11,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', read_views.dashboard, name='dashboard'),
     path('manage-users/', views.manage_users, name='manage_users'),
     path('create-task/', views.create_task, name='create_task'),
     path('', include('dashboard.urls')),